@@ -1,11 +1,40 @@
+import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
+from beanie.odm.utils.init import Initializer
+from pymongo.read_preferences import read_pref_mode_from_name, make_read_preference
 from config import settings
+from .metrics import mongo_command_listener
+from .profiler import slow_query_profiler
+from .startup import startup_report
 
 # Import all document models
 from .models.user import User
 from .models.task import Task
 from .models.label import Label
+from .models.session import RefreshSession
+
+DOCUMENT_MODELS = [User, Task, Label, RefreshSession]
+
+# Non-unique indexes superseded by declared ones: unique indexes on the same
+# keys (MongoDB refuses to build those while these exist) or compound indexes
+# they are a prefix of (kept, they only cost writes and memory)
+LEGACY_INDEXES = {
+    "users": ["email_1", "username_1"],
+    "tasks": ["user_id_1_deadline_1"],
+    "labels": ["user_id_1_name_1"],
+}
+
+
+class IndexlessInitializer(Initializer):
+    """
+    Beanie initializer that binds models to their collections without
+    reading or building indexes (Beanie 1.23 has no switch for this).
+    Indexes are then owned by app.migrate_indexes.
+    """
+    
+    async def init_indexes(self, cls, allow_index_dropping: bool = False):
+        return None
 
 
 class Database:
@@ -17,26 +46,46 @@ class Database:
     def __init__(self):
         self.client: AsyncIOMotorClient = None
         self.database = None
+        self.list_read_preference = None
+        self._list_collections = {}
     
-    async def connect(self):
+    async def connect(self, create_indexes: bool = None, allow_index_dropping: bool = False):
         """
         Initialize database connection and configure Beanie ODM.
         This should be called during application startup.
+        Indexes are created/reconciled only when create_indexes is true
+        (default: CREATE_INDEXES_ON_STARTUP); otherwise no index round trips
+        are made and app.migrate_indexes must have been run.
         """
+        if create_indexes is None:
+            create_indexes = DatabaseConfig.CREATE_INDEXES_ON_STARTUP
         try:
             # Get MongoDB URL from settings
             mongodb_url = settings.get_database_url()
             database_name = settings.get_database_name()
             
-            # Create Motor client
-            self.client = AsyncIOMotorClient(mongodb_url)
+            # Create Motor client with pool, timeout and write concern tuning
+            self.client = AsyncIOMotorClient(mongodb_url, **DatabaseConfig.client_options())
             self.database = self.client[database_name]
+            self.list_read_preference = DatabaseConfig.list_read_preference()
+            self._list_collections = {}
             
             # Initialize Beanie with all document models
-            await init_beanie(
-                database=self.database,
-                document_models=[User, Task, Label]
-            )
+            with startup_report.phase("beanie_init"):
+                if create_indexes:
+                    for collection_name in LEGACY_INDEXES:
+                        await self.drop_legacy_indexes(collection_name)
+                    await init_beanie(
+                        database=self.database,
+                        document_models=DOCUMENT_MODELS,
+                        allow_index_dropping=allow_index_dropping
+                    )
+                else:
+                    await IndexlessInitializer(database=self.database, document_models=DOCUMENT_MODELS)
+            startup_report.indexes_created = create_indexes
+            
+            with startup_report.phase("pool_warmup"):
+                await self.warm_up(DatabaseConfig.WARMUP_CONNECTIONS)
             
             print(f"Connected to MongoDB database: {database_name}")
             
@@ -44,6 +93,50 @@ class Database:
             print(f"Failed to connect to MongoDB: {e}")
             raise
     
+    async def drop_legacy_indexes(self, collection_name: str) -> list:
+        """
+        Drop the superseded non-unique indexes of a collection (LEGACY_INDEXES)
+        so their unique replacements can be built. Returns the names dropped.
+        """
+        collection = self.database[collection_name]
+        existing = await collection.index_information()
+        dropped = []
+        for name in LEGACY_INDEXES.get(collection_name, []):
+            if name in existing and not existing[name].get("unique"):
+                await collection.drop_index(name)
+                dropped.append(name)
+        if dropped:
+            print(f"Dropped legacy indexes on {collection_name}: {', '.join(dropped)}")
+        return dropped
+    
+    async def warm_up(self, connections: int):
+        """
+        Open pool connections ahead of traffic by running concurrent pings,
+        so the first requests after a deploy skip connection establishment.
+        """
+        if connections <= 0:
+            return
+        await asyncio.gather(*(self.client.admin.command("ping") for _ in range(connections)))
+    
+    def list_collection(self, document_model, primary: bool = False):
+        """
+        Get the Motor collection of a document model configured with the
+        read preference for list endpoints (MONGO_LIST_READ_PREFERENCE).
+        ETag-backed listings pass primary=True: their version counters are
+        read from the primary, so a lagging secondary could otherwise serve
+        an older body under the newer ETag.
+        """
+        if primary or self.list_read_preference is None or self.list_read_preference.mode == 0:
+            # Primary reads need no separate collection handle
+            return document_model.get_motor_collection()
+        collection = self._list_collections.get(document_model)
+        if collection is None:
+            collection = document_model.get_motor_collection().with_options(
+                read_preference=self.list_read_preference
+            )
+            self._list_collections[document_model] = collection
+        return collection
+    
     async def disconnect(self):
         """
         Close database connection.
@@ -126,11 +219,18 @@ class DatabaseConfig:
     """Database configuration constants"""
     
     # Connection settings
-    CONNECTION_TIMEOUT = 10000  # 10 seconds
-    SERVER_SELECTION_TIMEOUT = 5000  # 5 seconds
+    CONNECTION_TIMEOUT = settings.CONNECTION_TIMEOUT
+    SERVER_SELECTION_TIMEOUT = settings.SERVER_SELECTION_TIMEOUT
+    
+    # Pool settings
+    MAX_POOL_SIZE = settings.MONGO_MAX_POOL_SIZE
+    MIN_POOL_SIZE = settings.MONGO_MIN_POOL_SIZE
+    MAX_IDLE_TIME_MS = settings.MONGO_MAX_IDLE_TIME_MS
+    WAIT_QUEUE_TIMEOUT_MS = settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    WARMUP_CONNECTIONS = min(settings.MONGO_WARMUP_CONNECTIONS, settings.MONGO_MAX_POOL_SIZE)
     
     # Index settings
-    CREATE_INDEXES_ON_STARTUP = True
+    CREATE_INDEXES_ON_STARTUP = settings.CREATE_INDEXES_ON_STARTUP
     
     # Collection settings
     DEFAULT_COLLECTION_OPTIONS = {
@@ -138,3 +238,29 @@ class DatabaseConfig:
         "size": None,
         "max": None
     }
+    
+    @classmethod
+    def client_options(cls) -> dict:
+        """Keyword arguments for AsyncIOMotorClient built from settings."""
+        write_concern = settings.MONGO_WRITE_CONCERN
+        options = {
+            "connectTimeoutMS": cls.CONNECTION_TIMEOUT,
+            "serverSelectionTimeoutMS": cls.SERVER_SELECTION_TIMEOUT,
+            "maxPoolSize": cls.MAX_POOL_SIZE,
+            "minPoolSize": cls.MIN_POOL_SIZE,
+            "maxIdleTimeMS": cls.MAX_IDLE_TIME_MS,
+            "waitQueueTimeoutMS": cls.WAIT_QUEUE_TIMEOUT_MS,
+            "w": int(write_concern) if write_concern.isdigit() else write_concern,
+            "journal": settings.MONGO_WRITE_JOURNAL,
+            "event_listeners": [mongo_command_listener, slow_query_profiler],  # query metrics and slow-query capture
+        }
+        compressors = [c.strip() for c in settings.MONGO_COMPRESSORS.split(",") if c.strip()]
+        if compressors:
+            options["compressors"] = compressors
+        return options
+    
+    @classmethod
+    def list_read_preference(cls):
+        """Read preference used by list endpoints (e.g. 'secondaryPreferred')."""
+        mode = read_pref_mode_from_name(settings.MONGO_LIST_READ_PREFERENCE)
+        return make_read_preference(mode, None)
@@ -0,0 +1,162 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+from config import settings
+from .database import database
+from .serialization import dumps
+
+
+# Event sources: "routes" publishes from the mutation routes of this process;
+# "change_stream" tails one MongoDB change stream per process instead, which
+# also delivers writes made by other workers (requires a replica set).
+SOURCE_ROUTES = "routes"
+SOURCE_CHANGE_STREAM = "change_stream"
+
+
+def format_sse(event: str, data: dict) -> bytes:
+    """Encode one Server-Sent Events message."""
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+class Subscription:
+    """One connected client: a bounded queue of encoded messages."""
+
+    def __init__(self, user_id, queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+
+class TaskEventBroker:
+    """
+    In-process fan-out of task and label change events to subscribed clients.
+    Each event is encoded once and the same bytes are queued for every
+    subscriber of that user; publishing is a dict lookup when nobody listens.
+    A client whose queue fills up is dropped and told to resync.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[object, Set[Subscription]] = {}
+        self.published = 0
+        self.overflows = 0
+
+    @property
+    def connections(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self, user_id) -> Subscription:
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subs = self._subscribers.get(subscription.user_id)
+        if subs is None:
+            return
+        subs.discard(subscription)
+        if not subs:
+            del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id, event: str, data: dict) -> None:
+        """Queue an event for every subscriber of user_id."""
+        subs = self._subscribers.get(user_id)
+        if not subs:
+            return
+        message = format_sse(event, data)
+        self.published += 1
+        for subscription in list(subs):
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                subscription.overflowed = True
+                self.overflows += 1
+                self.unsubscribe(subscription)
+
+    def emit(self, user_id, event: str, data: dict) -> None:
+        """Publish from a mutation route; a no-op when the change stream is the source."""
+        if settings.TASK_EVENTS_SOURCE == SOURCE_ROUTES:
+            self.publish(user_id, event, data)
+
+    def stats(self) -> dict:
+        return {
+            "source": settings.TASK_EVENTS_SOURCE,
+            "users": len(self._subscribers),
+            "connections": self.connections,
+            "published": self.published,
+            "overflows": self.overflows,
+        }
+
+
+task_events = TaskEventBroker(queue_size=settings.TASK_EVENTS_QUEUE_SIZE)
+
+
+async def stream_events(user_id, heartbeat_seconds: Optional[float] = None):
+    """
+    Subscribe user_id and yield SSE messages until the client disconnects.
+    A comment line is sent when idle so proxies keep the connection open.
+    """
+    heartbeat_seconds = heartbeat_seconds or settings.TASK_EVENTS_HEARTBEAT_SECONDS
+    subscription = task_events.subscribe(user_id)
+    try:
+        yield b"retry: 5000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                message = b": keep-alive\n\n"
+            if subscription.overflowed:
+                # Events were lost; the client must refetch and reconnect
+                yield format_sse("resync", {})
+                return
+            yield message
+    finally:
+        task_events.unsubscribe(subscription)
+
+
+# Change stream events -> feed event names
+_OPERATIONS = {"insert": "created", "update": "updated", "replace": "updated", "delete": "deleted"}
+_ENTITIES = {"tasks": "task", "labels": "label"}
+
+
+async def run_change_stream_source():
+    """
+    Tail one change stream over tasks and labels and publish into the broker.
+    Started from the application lifespan when TASK_EVENTS_SOURCE=change_stream.
+    Delete events are routed by their pre-image, so enable
+    changeStreamPreAndPostImages on both collections (MongoDB 6.0+).
+    """
+    from .routes.tasks import task_response_serializer
+    from .routes.labels import label_serializer
+
+    serializers = {"tasks": task_response_serializer, "labels": label_serializer}
+    pipeline = [{"$match": {
+        "ns.coll": {"$in": list(_ENTITIES)},
+        "operationType": {"$in": list(_OPERATIONS)},
+    }}]
+    resume_token = None
+    while True:
+        try:
+            async with database.database.watch(
+                pipeline,
+                full_document="updateLookup",
+                full_document_before_change="whenAvailable",
+                resume_after=resume_token
+            ) as stream:
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    collection = change["ns"]["coll"]
+                    doc = change.get("fullDocument") or change.get("fullDocumentBeforeChange")
+                    if not doc or "user_id" not in doc:
+                        continue
+                    event = f"{_ENTITIES[collection]}.{_OPERATIONS[change['operationType']]}"
+                    if change["operationType"] == "delete":
+                        data = {"id": doc["_id"]}
+                    else:
+                        data = serializers[collection].shape(doc)
+                    task_events.publish(doc["user_id"], event, data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Task change stream failed, retrying: {e}")
+            await asyncio.sleep(1)
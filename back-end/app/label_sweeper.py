@@ -0,0 +1,66 @@
+import asyncio
+
+from config import settings
+from .models.task import Task
+from .models.label import Label
+from .versions import TASKS, bump_versions_many
+
+
+async def sweep_orphan_label_ids(batch_size: int = None) -> int:
+    """
+    Remove label ids that no longer match a Label document from tasks.
+    Walks the tasks collection in _id order one batch at a time, so each
+    update only touches a bounded set of documents and nothing is locked.
+    Returns the number of tasks that were cleaned.
+    """
+    batch_size = batch_size or settings.ORPHAN_SWEEP_BATCH_SIZE
+    tasks = Task.get_motor_collection()
+    labels = Label.get_motor_collection()
+    last_id = None
+    cleaned = 0
+    
+    while True:
+        query = {"label_ids.0": {"$exists": True}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await tasks.find(query, {"label_ids": 1, "user_id": 1}).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        last_id = batch[-1]["_id"]
+        
+        referenced = {label_id for doc in batch for label_id in doc.get("label_ids", [])}
+        existing = {
+            doc["_id"]
+            async for doc in labels.find({"_id": {"$in": list(referenced)}}, {"_id": 1})
+        }
+        orphans = list(referenced - existing)
+        if orphans:
+            result = await tasks.update_many(
+                {"_id": {"$in": [doc["_id"] for doc in batch]}},
+                {"$pull": {"label_ids": {"$in": orphans}}}
+            )
+            cleaned += result.modified_count
+            if result.modified_count:
+                await bump_versions_many((doc["user_id"] for doc in batch), TASKS)
+        
+        # Let request handlers run between batches
+        await asyncio.sleep(0)
+    
+    return cleaned
+
+
+async def run_label_sweeper():
+    """
+    Periodically sweep orphaned label ids until cancelled.
+    Started from the application lifespan when ORPHAN_SWEEP_INTERVAL_SECONDS > 0.
+    """
+    while True:
+        await asyncio.sleep(settings.ORPHAN_SWEEP_INTERVAL_SECONDS)
+        try:
+            cleaned = await sweep_orphan_label_ids()
+            if cleaned:
+                print(f"Label sweeper removed orphaned label ids from {cleaned} tasks")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Label sweeper failed: {e}")
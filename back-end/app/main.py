@@ -1,8 +1,18 @@
+# Imported first so the startup report covers the application's own imports
+from .startup import startup_report
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
-from .database import init_db, close_db
-from .routes import users, tasks, labels, auth
+import asyncio
+from .database import init_db, close_db, database
+from .label_sweeper import run_label_sweeper
+from .events import SOURCE_CHANGE_STREAM, run_change_stream_source
+from .scheduler import deadline_scheduler
+from .metrics import MetricsMiddleware, render_metrics
+from .routes import users, tasks, labels, auth, admin
+from .profiler import slow_query_profiler
+from .routes.auth import start_password_hasher, shutdown_password_hasher
 from config import settings
 
 
@@ -13,10 +23,33 @@ async def lifespan(app: FastAPI):
     Handles startup and shutdown events.
     """
     # Startup
+    startup_report.mark("imports")
     await init_db()
+    with startup_report.phase("profiler"):
+        await slow_query_profiler.start(database.database)
+    with startup_report.phase("password_hasher"):
+        await start_password_hasher()
+    sweeper = None
+    if settings.ORPHAN_SWEEP_INTERVAL_SECONDS > 0:
+        sweeper = asyncio.create_task(run_label_sweeper())
+    change_stream = None
+    if settings.TASK_EVENTS_SOURCE == SOURCE_CHANGE_STREAM:
+        change_stream = asyncio.create_task(run_change_stream_source())
+    scheduler = None
+    if settings.TASK_SCHEDULER_ENABLED:
+        scheduler = asyncio.create_task(deadline_scheduler.run())
+    startup_report.ready()
     yield
     # Shutdown
+    if sweeper:
+        sweeper.cancel()
+    if change_stream:
+        change_stream.cancel()
+    if scheduler:
+        scheduler.cancel()
+    slow_query_profiler.stop()
     await close_db()
+    shutdown_password_hasher()
 
 
 app = FastAPI(
@@ -35,11 +68,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route request counts and latency
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(tasks.router)
 app.include_router(labels.router)
+app.include_router(admin.router)
 
 
 @app.get(
@@ -79,4 +116,18 @@ async def health_check():
         "status": "healthy" if db_healthy else "unhealthy",
         "database": "connected" if db_healthy else "disconnected",
         "api": "running"
-    }
\ No newline at end of file
+    }
+
+
+@app.get(
+    "/metrics",
+    tags=["Health"],
+    summary="Prometheus metrics",
+    description="Per-route request counts and latency, and per-collection MongoDB command metrics",
+    response_class=PlainTextResponse
+)
+async def metrics():
+    """
+    Metrics endpoint in Prometheus text exposition format.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
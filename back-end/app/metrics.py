@@ -0,0 +1,213 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Tuple
+
+from pymongo import monitoring
+
+
+# ASGI scope of the request being served, for attributing database work to routes
+current_request_scope: contextvars.ContextVar = contextvars.ContextVar("current_request_scope", default=None)
+
+# Latency buckets in seconds shared by HTTP and MongoDB histograms
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    """Monotonic counter with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    """Cumulative histogram with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    bucket_labels = _format_labels(self.label_names, labels, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {series[-1]}")
+                lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return "\n".join(lines)
+
+
+# HTTP metrics
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")
+)
+
+# MongoDB metrics
+mongo_commands_total = Counter(
+    "mongo_commands_total", "MongoDB commands by collection and outcome.", ("collection", "command", "outcome")
+)
+mongo_command_duration_seconds = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency by collection.", ("collection", "command")
+)
+mongo_documents_returned_total = Counter(
+    "mongo_documents_returned_total", "Documents returned by MongoDB cursors.", ("collection", "command")
+)
+
+# Auth rate limiting
+rate_limit_decisions_total = Counter(
+    "rate_limit_decisions_total", "Login/registration rate limiter decisions by limiter and outcome.", ("limiter", "outcome")
+)
+
+# Slow-query profiler
+slow_query_explains_total = Counter(
+    "slow_query_explains_total", "Slow-query profiler explain decisions by outcome (run, cached, dropped, error).", ("outcome",)
+)
+
+REGISTRY = [
+    http_requests_total,
+    http_request_duration_seconds,
+    mongo_commands_total,
+    mongo_command_duration_seconds,
+    mongo_documents_returned_total,
+    rate_limit_decisions_total,
+    slow_query_explains_total,
+]
+
+
+def render_metrics() -> str:
+    """Render every registered metric in Prometheus text exposition format."""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and latency per route template.
+    Using the matched route (e.g. /tasks/{task_id}) keeps label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        token = current_request_scope.set(scope)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request_scope.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_requests_total.inc((method, path, str(status_code)))
+            http_request_duration_seconds.observe((method, path), time.perf_counter() - start)
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """
+    PyMongo command listener recording per-collection counts, durations and
+    documents returned. Events arrive on driver threads, hence the lock.
+    """
+
+    # Commands whose first argument is not a collection name
+    _IGNORED = {"ping", "hello", "isMaster", "ismaster", "saslStart", "saslContinue", "endSessions", "killCursors"}
+
+    def __init__(self):
+        self._pending: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, event) -> Tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event):
+        if event.command_name in self._IGNORED:
+            return
+        collection = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        if not isinstance(collection, str):
+            collection = "n/a"
+        with self._lock:
+            self._pending[self._key(event)] = collection
+
+    def _finish(self, event, outcome: str, reply=None):
+        with self._lock:
+            collection = self._pending.pop(self._key(event), None)
+        if collection is None:
+            return
+        labels = (collection, event.command_name)
+        mongo_commands_total.inc((collection, event.command_name, outcome))
+        mongo_command_duration_seconds.observe(labels, event.duration_micros / 1_000_000)
+        if reply:
+            cursor = reply.get("cursor") or {}
+            batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+            if batch is not None:
+                mongo_documents_returned_total.inc(labels, len(batch))
+
+    def succeeded(self, event):
+        self._finish(event, "success", event.reply)
+
+    def failed(self, event):
+        self._finish(event, "failure")
+
+
+mongo_command_listener = MongoCommandListener()
@@ -0,0 +1,87 @@
+"""
+Create or reconcile the MongoDB indexes declared by every document model.
+
+Run once per deploy (e.g. as a release job) so application processes can
+start with CREATE_INDEXES_ON_STARTUP=False and skip index round trips.
+Uses the same MONGODB_URL / DATABASE_NAME settings as the app.
+
+Run from back-end/:
+    python -m app.migrate_indexes
+    python -m app.migrate_indexes --drop-unused
+
+Building a unique index fails while duplicates exist; the command then exits
+non-zero and the remaining collections are left untouched.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from .database import DOCUMENT_MODELS, Initializer, database
+
+
+def declared_index_names(model) -> set:
+    """Names of the indexes a model declares in Settings.indexes (plus _id_)."""
+    return {"_id_"} | {index.name for index in model.get_settings().indexes or []}
+
+
+async def migrate_indexes(drop_unused: bool = False) -> list:
+    """
+    Create missing indexes (and drop undeclared ones if drop_unused) for each
+    model; returns one report entry per collection.
+    Undeclared indexes are matched by name rather than by Beanie's key-spec
+    comparison, which never matches text indexes (the server reports them
+    as _fts/_ftsx keys) and would rebuild them on every run.
+    """
+    await database.connect(create_indexes=False)
+    initializer = Initializer(database=database.database, document_models=DOCUMENT_MODELS)
+    report = []
+    try:
+        for model in DOCUMENT_MODELS:
+            collection = model.get_motor_collection()
+            before = set(await collection.index_information())
+            started = time.perf_counter()
+            dropped = await database.drop_legacy_indexes(collection.name)
+            if drop_unused:
+                for name in sorted(before - declared_index_names(model) - set(dropped)):
+                    await collection.drop_index(name)
+                    dropped.append(name)
+            await initializer.init_indexes(model)
+            after = set(await collection.index_information())
+            report.append({
+                "collection": collection.name,
+                "created": sorted(after - (before - set(dropped))),
+                "dropped": sorted(dropped),
+                "unchanged": sorted((before - set(dropped)) & after),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            })
+    finally:
+        await database.disconnect()
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Create or reconcile MongoDB indexes for the Todo API")
+    parser.add_argument(
+        "--drop-unused",
+        action="store_true",
+        help="Also drop indexes whose name no model declares (never drops _id_)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        report = asyncio.run(migrate_indexes(drop_unused=args.drop_unused))
+    except Exception as e:
+        sys.exit(f"Index migration failed: {e}")
+    for entry in report:
+        print(
+            f"{entry['collection']}: created {entry['created'] or '-'}, dropped {entry['dropped'] or '-'}, "
+            f"unchanged {len(entry['unchanged'])} ({entry['duration_ms']}ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,5 +4,6 @@
 from .user import User
 from .task import Task
 from .label import Label
+from .session import RefreshSession
 
-__all__ = ["User", "Task", "Label"]
+__all__ = ["User", "Task", "Label", "RefreshSession"]
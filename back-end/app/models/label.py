@@ -3,6 +3,7 @@ from typing import Optional
 from beanie import Document
 from pydantic import BaseModel, Field
 from beanie import PydanticObjectId
+from pymongo import IndexModel
 
 
 class Label(Document):
@@ -26,7 +27,7 @@ class Label(Document):
     class Settings:
         name = "labels"  # MongoDB collection name
         indexes = [
-            [("user_id", 1), ("name", 1)],  # Compound index: unique label name per user
+            IndexModel([("user_id", 1), ("name", 1)], unique=True, name="user_label_name_unique"),  # Compound index: unique label name per user
         ]
     
     class Config:
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Optional
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import IndexModel
+
+
+class RefreshSession(Document):
+    """
+    Refresh token session for long-term logins.
+    Only a SHA-256 hash of the token is stored; each device gets its own session.
+    """
+    
+    # Required fields
+    token_hash: str = Field(..., description="SHA-256 hex digest of the refresh token")
+    user_id: PydanticObjectId = Field(..., description="ID of the user who owns this session")
+    expires_at: datetime = Field(..., description="Expiration timestamp; MongoDB purges the session afterwards")
+    
+    # Optional fields
+    user_agent: Optional[str] = Field(None, max_length=300, description="Client that created the session")
+    
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="Session creation timestamp")
+    
+    class Settings:
+        name = "refresh_sessions"  # MongoDB collection name
+        indexes = [
+            IndexModel([("token_hash", 1)], unique=True),  # O(1) lookup by token hash
+            IndexModel([("expires_at", 1)], expireAfterSeconds=0),  # TTL index purges expired sessions
+            "user_id",  # Index for revoking all sessions of a user
+        ]
+    
+    def __str__(self) -> str:
+        return f"RefreshSession(id={self.id}, user_id={self.user_id}, expires_at={self.expires_at})"
+    
+    def __repr__(self) -> str:
+        return self.__str__()
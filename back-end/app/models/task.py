@@ -1,9 +1,10 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import List, Optional, Union
 from enum import Enum
 from beanie import Document
 from pydantic import BaseModel, Field
 from beanie import PydanticObjectId
+from pymongo import IndexModel, TEXT
 
 
 class PriorityLevel(str, Enum):
@@ -42,6 +43,7 @@ class Task(Document):
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Task creation timestamp")
     updated_at: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
     completed_at: Optional[datetime] = Field(None, description="Task completion timestamp")
+    overdue_at: Optional[datetime] = Field(None, description="When the deadline scheduler marked the task overdue")
     
     class Settings:
         name = "tasks"  # MongoDB collection name
@@ -51,7 +53,13 @@ class Task(Document):
             "priority", # Index for filtering by priority
             "deadline", # Index for sorting by deadline
             [("user_id", 1), ("status", 1)],  # Compound index for user's tasks by status
-            [("user_id", 1), ("deadline", 1)],  # Compound index for user's tasks by deadline
+            [("user_id", 1), ("deadline", 1), ("_id", 1)],  # Compound index for user's tasks by deadline (keyset pagination)
+            [("user_id", 1), ("label_ids", 1)],  # Multikey index for user's tasks by label
+            IndexModel(
+                [("user_id", 1), ("title", TEXT), ("description", TEXT)],
+                weights={"title": 10, "description": 1},
+                name="user_text_search"
+            ),  # Full-text search over a user's tasks (user_id equality prefix)
         ]
     
     class Config:
@@ -99,6 +107,7 @@ class TaskResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     completed_at: Optional[datetime]
+    overdue_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -107,6 +116,16 @@ class TaskResponse(BaseModel):
         }
 
 
+class TaskSummary(BaseModel):
+    """Slim schema for list screens (view=summary); omits description and timestamps"""
+    id: str
+    title: str
+    priority: PriorityLevel
+    deadline: datetime
+    status: TaskStatus
+    label_ids: List[str]
+
+
 class TaskWithLabels(TaskResponse):
     """Schema for task with label details"""
     labels: List[dict] = Field(default_factory=list, description="Full label objects")
@@ -125,6 +144,78 @@ class TaskFilter(BaseModel):
     search: Optional[str] = Field(None, description="Search in title and description")
 
 
+class TaskPage(BaseModel):
+    """Schema for a page of tasks returned by keyset pagination"""
+    items: List[Union[TaskWithLabels, TaskResponse, TaskSummary]]
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, null on the last page")
+
+
+class BulkOperationType(str, Enum):
+    """Kinds of operations accepted by the bulk task endpoint"""
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class TaskBulkOperation(BaseModel):
+    """Schema for one operation in a bulk task request"""
+    op: BulkOperationType
+    task_id: Optional[str] = Field(None, description="Target task ID (required for update and delete)")
+    create: Optional[TaskCreate] = Field(None, description="Task fields (required for create)")
+    update: Optional[TaskUpdate] = Field(None, description="Fields to change (required for update)")
+
+
+class TaskBulkRequest(BaseModel):
+    """Schema for a bulk task request"""
+    operations: List[TaskBulkOperation] = Field(..., min_length=1, max_length=1000)
+
+
+class TaskBulkItemResult(BaseModel):
+    """Schema for the outcome of one bulk operation"""
+    index: int
+    op: BulkOperationType
+    success: bool
+    task_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class TaskBulkResponse(BaseModel):
+    """Schema for bulk task results"""
+    created: int
+    updated: int
+    deleted: int
+    failed: int
+    results: List[TaskBulkItemResult]
+
+
+class TaskSearchHit(TaskResponse):
+    """Schema for a full-text search result"""
+    score: float = Field(..., description="Text relevance score")
+    snippet: Optional[str] = Field(None, description="Matching excerpt with terms wrapped in <mark> tags")
+
+
+class TaskSearchPage(BaseModel):
+    """Schema for a page of search results"""
+    items: List[TaskSearchHit]
+    next_offset: Optional[int] = Field(None, description="Offset of the next page, null on the last page")
+
+
+class AgendaDay(BaseModel):
+    """One local calendar day of the agenda"""
+    date: date
+    count: int
+    tasks: List[TaskSummary]
+
+
+class TaskAgenda(BaseModel):
+    """Tasks due in a date window, bucketed by local day"""
+    from_date: date
+    to_date: date
+    tz: str
+    total: int
+    days: List[AgendaDay]
+
+
 class TaskStats(BaseModel):
     """Schema for task statistics"""
     total_tasks: int
@@ -1,8 +1,33 @@
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 from beanie import Document, Indexed
-from pydantic import BaseModel, EmailStr, Field
-from pydantic_extra_types.phone_numbers import PhoneNumber
+from pydantic import AfterValidator, BaseModel, EmailStr, Field, StringConstraints, WithJsonSchema
+from pydantic_core import PydanticCustomError
+from pymongo import IndexModel
+
+
+def validate_phone_number(value: str) -> str:
+    """
+    Validate and format a phone number as RFC 3966, like pydantic_extra_types'
+    PhoneNumber, but phonenumbers (slow to import) is only loaded on first use.
+    """
+    import phonenumbers
+    try:
+        parsed = phonenumbers.parse(value, None)
+    except phonenumbers.NumberParseException as exc:
+        raise PydanticCustomError("value_error", "value is not a valid phone number") from exc
+    if not phonenumbers.is_valid_number(parsed):
+        raise PydanticCustomError("value_error", "value is not a valid phone number")
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.RFC3966)
+
+
+PhoneNumber = Annotated[
+    str,
+    # Same bounds as pydantic_extra_types' PhoneNumber, checked before parsing
+    StringConstraints(min_length=7, max_length=64),
+    AfterValidator(validate_phone_number),
+    WithJsonSchema({"type": "string", "format": "phone", "minLength": 7, "maxLength": 64}),
+]
 
 
 class User(Document):
@@ -23,8 +48,9 @@ class User(Document):
     is_active: bool = Field(True, description="Whether the user account is active")
     is_verified: bool = Field(False, description="Whether the user's email is verified")
     is_admin: bool = Field(False, description="Whether the user has administrator privileges")
-    refresh_token: Optional[str] = Field(None, description="Current refresh token for long-term sessions")
-    refresh_token_expires: Optional[datetime] = Field(None, description="Expiration timestamp of the refresh token")
+    # Legacy single-session fields; refresh tokens now live in RefreshSession
+    refresh_token: Optional[str] = Field(None, description="Deprecated: superseded by the refresh_sessions collection")
+    refresh_token_expires: Optional[datetime] = Field(None, description="Deprecated: superseded by the refresh_sessions collection")
     
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Account creation timestamp")
@@ -34,8 +60,8 @@ class User(Document):
     class Settings:
         name = "users"  # MongoDB collection name
         indexes = [
-            "email",  # Unique index on email
-            "username",  # Unique index on username
+            IndexModel([("email", 1)], unique=True, name="email_unique"),  # Unique index on email
+            IndexModel([("username", 1)], unique=True, name="username_unique"),  # Unique index on username
         ]
     
     class Config:
@@ -0,0 +1,194 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from pymongo import monitoring
+
+from config import settings
+from .metrics import current_request_scope, slow_query_explains_total
+
+
+# Commands worth explaining; getMore/explain/etc. are skipped
+PROFILED_COMMANDS = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+
+# Bound on remembered query shapes for explain deduplication
+_MAX_EXPLAINED_SHAPES = 1000
+
+# Driver-added fields that explain does not accept inside the explained command
+_SESSION_FIELDS = {"lsid", "$db", "$clusterTime", "$readPreference", "txnNumber", "readConcern", "writeConcern"}
+
+
+def _query_shape(command_name: str, command: dict) -> list:
+    """Field names used by a command's filter, without values, for grouping."""
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or [{}]
+        query = pipeline[0].get("$match", {}) if pipeline else {}
+    elif command_name in ("update", "delete"):
+        statements = command.get("updates") or command.get("deletes") or [{}]
+        query = statements[0].get("q", {})
+    else:
+        query = command.get("filter") or command.get("query") or {}
+    return sorted(query.keys()) if isinstance(query, dict) else []
+
+
+def _find_plan_stages(plan: dict) -> list:
+    """Flatten a winning plan tree into its stage names (and index names)."""
+    stages = []
+    while isinstance(plan, dict) and plan:
+        stage = plan.get("stage")
+        if stage:
+            if plan.get("indexName"):
+                stage = f"{stage}({plan['indexName']})"
+            stages.append(stage)
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0] or plan.get("queryPlan")
+    return stages
+
+
+def summarize_explain(explain: dict) -> dict:
+    """Extract the winning plan and examined counts from an explain() result."""
+    # Aggregations nest the find-layer explain under the first $cursor stage
+    if "stages" in explain and explain["stages"]:
+        explain = explain["stages"][0].get("$cursor", explain)
+    planner = explain.get("queryPlanner", {})
+    stats = explain.get("executionStats", {})
+    stages = _find_plan_stages(planner.get("winningPlan", {}))
+    return {
+        "plan": " <- ".join(stages),
+        "collscan": any(stage.startswith("COLLSCAN") for stage in stages),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "docs_examined": stats.get("totalDocsExamined"),
+        "n_returned": stats.get("nReturned"),
+    }
+
+
+class SlowQueryProfiler(monitoring.CommandListener):
+    """
+    Opt-in command listener that captures commands slower than
+    SLOW_QUERY_THRESHOLD_MS, explains them, and stores the winning plan with
+    the originating route in a capped collection.
+    Driver events arrive on worker threads, so explains are scheduled back
+    onto the application event loop.
+
+    Explaining adds load exactly when the database is slow, so it is kept
+    cheap: each (collection, command, shape) is explained at most once per
+    SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS (later entries reuse that plan), at
+    most SLOW_QUERY_MAX_CONCURRENT_EXPLAINS run at once (the rest are
+    skipped and counted), and the default queryPlanner verbosity plans the
+    command without executing it again.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._database = None
+        self._explained: Dict[Tuple, tuple] = {}  # (collection, command, shape) -> (explained at, summary)
+        self._explains_in_flight = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.SLOW_QUERY_PROFILING and self._loop is not None
+
+    async def start(self, database) -> None:
+        """Bind to the running loop and ensure the capped collection exists."""
+        if not settings.SLOW_QUERY_PROFILING:
+            return
+        self._database = database
+        if settings.SLOW_QUERY_COLLECTION not in await database.list_collection_names():
+            await database.create_collection(
+                settings.SLOW_QUERY_COLLECTION,
+                capped=True,
+                size=settings.SLOW_QUERY_COLLECTION_BYTES
+            )
+        self._loop = asyncio.get_running_loop()
+
+    def stop(self) -> None:
+        self._loop = None
+
+    def started(self, event):
+        if not self.enabled or event.command_name not in PROFILED_COMMANDS:
+            return
+        scope = current_request_scope.get()
+        route = None
+        if scope is not None:
+            matched = scope.get("route")
+            route = f"{scope.get('method', '')} {getattr(matched, 'path', scope.get('path', ''))}"
+        command = {k: v for k, v in event.command.items() if k not in _SESSION_FIELDS}
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (command, route)
+
+    def succeeded(self, event):
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None or self._loop is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+            return
+        command, route = pending
+        asyncio.run_coroutine_threadsafe(
+            self.record(event.command_name, command, route, duration_ms), self._loop
+        )
+
+    def failed(self, event):
+        with self._lock:
+            self._pending.pop((event.connection_id, event.request_id), None)
+
+    async def explain(self, key: Tuple, command: dict) -> dict:
+        """
+        Plan summary for a slow command: reused within the cooldown, skipped
+        when too many explains are already running, otherwise explained.
+        Runs on the event loop, so the checks below cannot race.
+        """
+        cached = self._explained.get(key)
+        if cached is not None and time.monotonic() - cached[0] < settings.SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS:
+            slow_query_explains_total.inc(("cached",))
+            return cached[1]
+        if self._explains_in_flight >= settings.SLOW_QUERY_MAX_CONCURRENT_EXPLAINS:
+            slow_query_explains_total.inc(("dropped",))
+            return {"plan": None, "collscan": None, "error": "explain skipped: too many in flight"}
+        self._explains_in_flight += 1
+        try:
+            explain = await self._database.command(
+                {"explain": command, "verbosity": settings.SLOW_QUERY_EXPLAIN_VERBOSITY}
+            )
+            summary = summarize_explain(explain)
+        except Exception as e:
+            slow_query_explains_total.inc(("error",))
+            return {"plan": None, "collscan": None, "error": str(e)}
+        finally:
+            self._explains_in_flight -= 1
+        slow_query_explains_total.inc(("run",))
+        if len(self._explained) >= _MAX_EXPLAINED_SHAPES:
+            self._explained.clear()
+        self._explained[key] = (time.monotonic(), summary)
+        return summary
+
+    async def record(self, command_name: str, command: dict, route: Optional[str], duration_ms: float) -> None:
+        """Store a slow command with its (possibly cached) plan."""
+        collection = command.get(command_name)
+        shape = _query_shape(command_name, command)
+        summary = await self.explain((collection, command_name, tuple(shape)), command)
+        entry = {
+            "timestamp": datetime.utcnow(),
+            "route": route,
+            "collection": collection,
+            "command": command_name,
+            "shape": shape,
+            "duration_ms": round(duration_ms, 3),
+            **summary,
+        }
+        try:
+            await self._database[settings.SLOW_QUERY_COLLECTION].insert_one(entry)
+        except Exception as e:
+            print(f"Failed to record slow query: {e}")
+        if settings.SLOW_QUERY_LOG:
+            print(
+                f"Slow query {duration_ms:.1f}ms on {collection}.{command_name} "
+                f"from {route}: {entry.get('plan')}"
+            )
+
+
+slow_query_profiler = SlowQueryProfiler()
@@ -0,0 +1,161 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from config import settings
+from .metrics import rate_limit_decisions_total
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """Parse "<attempts>/<seconds>" (e.g. "10/60") into bucket capacity and period."""
+    attempts, _, seconds = rate.partition("/")
+    return int(attempts), float(seconds or 60)
+
+
+class MemoryBucketBackend:
+    """
+    Token buckets held in this process, bounded to max_keys with LRU
+    eviction. Each worker enforces its own limits.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / refill_per_second
+
+
+# Atomic token bucket using the Redis server clock, so every worker shares one view
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisBucketBackend:
+    """
+    Token buckets shared by every worker through Redis (RATE_LIMIT_REDIS_URL).
+    redis is imported lazily so it is only needed when this backend is used.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> Tuple[bool, float]:
+        allowed, retry_after = await self._script(keys=[self.prefix + key], args=[capacity, refill_per_second])
+        return bool(int(allowed)), float(retry_after)
+
+
+def create_backend():
+    """Backend selected by RATE_LIMIT_BACKEND ("memory" or "redis")."""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisBucketBackend(settings.RATE_LIMIT_REDIS_URL)
+    return MemoryBucketBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+class TokenBucketLimiter:
+    """
+    One named limit ("<attempts>/<seconds>") applied per key, e.g. per IP.
+    Decisions are counted in rate_limit_decisions_total. Backend errors fail
+    open so an unavailable Redis cannot lock everyone out.
+    """
+
+    def __init__(self, name: str, rate: str, backend):
+        self.name = name
+        self.capacity, period = parse_rate(rate)
+        self.refill_per_second = self.capacity / period
+        self.backend = backend
+
+    async def hit(self, key: str) -> Tuple[bool, float]:
+        """Take one token for key; returns (allowed, seconds until the next token)."""
+        if self.capacity <= 0:
+            return True, 0.0
+        try:
+            allowed, retry_after = await self.backend.take(
+                f"{self.name}:{key}", self.capacity, self.refill_per_second
+            )
+        except Exception as e:
+            print(f"Rate limiter {self.name} backend failed: {e}")
+            rate_limit_decisions_total.inc((self.name, "error"))
+            return True, 0.0
+        rate_limit_decisions_total.inc((self.name, "allowed" if allowed else "rejected"))
+        return allowed, retry_after
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = create_backend()
+    return _backend
+
+
+class AuthRateLimits:
+    """Per-IP and per-username limits for login and registration."""
+
+    def __init__(self):
+        self._limiters = None
+
+    def _build(self) -> dict:
+        backend = get_backend()
+        return {
+            ("login", "ip"): TokenBucketLimiter("login_ip", settings.RATE_LIMIT_LOGIN_IP, backend),
+            ("login", "username"): TokenBucketLimiter("login_username", settings.RATE_LIMIT_LOGIN_USERNAME, backend),
+            ("register", "ip"): TokenBucketLimiter("register_ip", settings.RATE_LIMIT_REGISTER_IP, backend),
+            ("register", "username"): TokenBucketLimiter("register_username", settings.RATE_LIMIT_REGISTER_USERNAME, backend),
+        }
+
+    async def check(self, action: str, ip: str, username: str) -> Tuple[bool, int]:
+        """
+        Take a token from the action's IP and username buckets.
+        Returns (allowed, Retry-After seconds); both buckets are charged so a
+        blocked IP cannot keep probing one account and vice versa.
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return True, 0
+        if self._limiters is None:
+            self._limiters = self._build()
+        results = [
+            await self._limiters[(action, "ip")].hit(ip),
+            await self._limiters[(action, "username")].hit(username.strip().lower()),
+        ]
+        allowed = all(ok for ok, _ in results)
+        retry_after = max((wait for ok, wait in results if not ok), default=0)
+        return allowed, math.ceil(retry_after)
+
+
+auth_rate_limits = AuthRateLimits()
@@ -1,6 +1,6 @@
 # Routes package for the Todo App API
 # This package contains all API route definitions
 
-from . import users, tasks, labels
+from . import users, tasks, labels, admin
 
-__all__ = ["users", "tasks", "labels"]
+__all__ = ["users", "tasks", "labels", "admin"]
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from .auth import require_admin
+from ..models.user import User
+from ..database import database
+from ..events import task_events
+from ..scheduler import deadline_scheduler
+from ..startup import startup_report
+from config import settings
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    _: User = Depends(require_admin)
+):
+    """Admin: Worst slow-query offenders grouped by route, collection, command shape and plan"""
+    if not settings.SLOW_QUERY_PROFILING:
+        raise HTTPException(status_code=404, detail="Slow-query profiling is disabled (set SLOW_QUERY_PROFILING=true)")
+    try:
+        pipeline = [
+            {"$group": {
+                "_id": {
+                    "route": "$route",
+                    "collection": "$collection",
+                    "command": "$command",
+                    "shape": "$shape",
+                    "plan": "$plan",
+                },
+                "count": {"$sum": 1},
+                "max_ms": {"$max": "$duration_ms"},
+                "avg_ms": {"$avg": "$duration_ms"},
+                "collscan": {"$max": "$collscan"},
+                "max_docs_examined": {"$max": "$docs_examined"},
+                "max_keys_examined": {"$max": "$keys_examined"},
+                "last_seen": {"$max": "$timestamp"},
+            }},
+            {"$sort": {"max_ms": -1}},
+            {"$limit": limit},
+        ]
+        rows = await database.database[settings.SLOW_QUERY_COLLECTION].aggregate(pipeline).to_list(length=limit)
+        return [{**row.pop("_id"), **row, "avg_ms": round(row["avg_ms"], 3)} for row in rows]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.get("/task-events")
+async def get_task_event_stats(_: User = Depends(require_admin)):
+    """Admin: Live feed connections and delivery counters for this process"""
+    return task_events.stats()
+
+
+@router.get("/scheduler")
+async def get_scheduler_stats(_: User = Depends(require_admin)):
+    """Admin: Deadline scheduler heap size, horizon and counters for this process"""
+    return deadline_scheduler.stats()
+
+
+@router.get("/startup")
+async def get_startup_report(_: User = Depends(require_admin)):
+    """Admin: How long this process took to start, per phase"""
+    return startup_report.stats()
@@ -1,15 +1,28 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import hashlib
+import multiprocessing
 import secrets
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 import os
 from pydantic import BaseModel
+from pymongo.errors import DuplicateKeyError
 
 from ..models.user import User, UserCreate, UserResponse
+from ..models.session import RefreshSession
+from ..cache import TTLCache
+from ..ratelimit import auth_rate_limits
+from config import settings
+
+
+class StreamTokenResponse(BaseModel):
+    """Response model for the event stream token endpoint"""
+    stream_token: str
+    expires_in: int
 
 
 class TokenResponse(BaseModel):
@@ -27,27 +40,132 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 30  # 30 days for refresh token
+# EventSource cannot send headers, so the feed takes a token in its URL; it is
+# minted per connection, only valid for the event stream and expires quickly
+STREAM_TOKEN_SCOPE = "events"
+STREAM_TOKEN_EXPIRE_SECONDS = 60
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__default_rounds=12,
-    bcrypt__truncate_error=False  # Don't error on long passwords
-)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
+
+# Authenticated users keyed by username, so hot clients skip the per-request lookup
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_cached_user(username: str) -> None:
+    """Drop a user from the cache after their document changes"""
+    user_cache.invalidate(username)
+
+
+# passlib and jose are imported on first use so they stay off the startup path
+_pwd_context = None
+
+
+def get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+            # Hashes with any other cost are flagged for rehash on the next login
+            bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+            bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+            bcrypt__truncate_error=False  # Don't error on long passwords
+        )
+    return _pwd_context
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     # Bcrypt has a 72-byte limit
-    return pwd_context.verify(plain_password[:72], hashed_password)
+    return get_pwd_context().verify(plain_password[:72], hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     # Bcrypt has a 72-byte limit
-    return pwd_context.hash(password[:72])
+    return get_pwd_context().hash(password[:72])
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if its rounds are outdated"""
+    return get_pwd_context().verify_and_update(plain_password[:72], hashed_password)
+
+
+# Bcrypt work runs on a dedicated pool so it never blocks the event loop
+_hash_executor: Optional[Executor] = None
+_pending_hash_jobs = 0
+
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            # Spawned workers start clean instead of forking a process that
+            # already runs an event loop and driver threads
+            _hash_executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash"
+            )
+    return _hash_executor
+
+
+async def run_password_job(func: Callable, *args):
+    """
+    Run a password hashing function on the hash pool.
+    Rejects with 503 when too many jobs are already queued or running.
+    """
+    global _pending_hash_jobs
+    if _pending_hash_jobs >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    _pending_hash_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _pending_hash_jobs -= 1
+
+
+def _warm_hash_worker() -> None:
+    get_pwd_context()
+
+
+async def start_password_hasher() -> None:
+    """
+    Create the hash pool; called on application startup.
+    In process mode every worker is started and has loaded passlib before
+    the first login, instead of that login paying the spawn cost.
+    """
+    executor = _get_hash_executor()
+    if settings.PASSWORD_HASH_EXECUTOR == "process":
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, _warm_hash_worker) for _ in range(settings.PASSWORD_HASH_WORKERS)
+        ))
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the hash pool; called on application shutdown"""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    from jose import jwt
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
     to_encode.update({"exp": expire})
@@ -55,7 +173,12 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+async def user_from_token(token: str, scope: Optional[str] = None) -> User:
+    """
+    Resolve the user of a signed token. Access tokens carry no scope; scoped
+    tokens (e.g. stream tokens) are only accepted where that scope is asked for.
+    """
+    from jose import JWTError, jwt
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -64,42 +187,101 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: Optional[str] = payload.get("sub")
-        if username is None:
+        if username is None or payload.get("scope") != scope:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
-    user = await User.find_one(User.username == username)
+    user = user_cache.get(username)
     if user is None:
-        raise credentials_exception
+        user = await User.find_one(User.username == username)
+        if user is None:
+            raise credentials_exception
+        user_cache.set(username, user)
     return user
 
 
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+    return await user_from_token(token)
+
+
+async def get_stream_user(
+    stream_token: Optional[str] = None,
+    token: Optional[str] = Depends(oauth2_scheme_optional)
+) -> User:
+    """Like get_current_user, but EventSource clients, which cannot send headers, pass ?stream_token= instead"""
+    if token:
+        return await user_from_token(token)
+    return await user_from_token(stream_token or "", STREAM_TOKEN_SCOPE)
+
+
 async def require_admin(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return current_user
 
 
+def client_ip(request: Request) -> str:
+    """Client address for rate limiting; X-Forwarded-For is only trusted behind a known proxy"""
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def enforce_auth_rate_limit(request: Request, action: str, username: str) -> None:
+    """Reject excess login/registration attempts with 429 before any password hashing"""
+    allowed, retry_after = await auth_rate_limits.check(action, client_ip(request), username)
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please try again later",
+            headers={"Retry-After": str(max(retry_after, 1))},
+        )
+
+
+async def duplicate_key_field(error: DuplicateKeyError, user: User) -> str:
+    """
+    Which unique user field ("email" or "username") a failed insert collided on.
+    Read from the server's keyPattern, never the message text (it embeds the
+    duplicate value); falls back to a lookup when the server omits it.
+    """
+    key_pattern = (error.details or {}).get("keyPattern") or {}
+    if "email" in key_pattern:
+        return "email"
+    if "username" in key_pattern:
+        return "username"
+    if await User.find_one(User.email == user.email):
+        return "email"
+    return "username"
+
+
 @router.post("/register", response_model=UserResponse)
-async def register_user(user_data: UserCreate):
-    # Check for existing email/username
+async def register_user(request: Request, user_data: UserCreate):
+    await enforce_auth_rate_limit(request, "register", user_data.username)
+    # Indexed pre-checks turn away duplicates before paying for a bcrypt hash
     if await User.find_one(User.email == user_data.email):
         raise HTTPException(status_code=400, detail="Email already registered")
     if await User.find_one(User.username == user_data.username):
         raise HTTPException(status_code=400, detail="Username already taken")
-
     user = User(
         email=user_data.email,
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await run_password_job(get_password_hash, user_data.password),
         first_name=user_data.first_name,
         last_name=user_data.last_name,
         phone_number=user_data.phone_number,
         is_active=True,
         is_verified=False,
     )
-    await user.insert()
+    # Unique indexes on email and username reject duplicates that race past the pre-checks
+    try:
+        await user.insert()
+    except DuplicateKeyError as e:
+        if await duplicate_key_field(e, user) == "email":
+            raise HTTPException(status_code=400, detail="Email already registered")
+        raise HTTPException(status_code=400, detail="Username already taken")
 
     return UserResponse(
         id=str(user.id),
@@ -121,15 +303,45 @@ def generate_refresh_token() -> str:
     return secrets.token_urlsafe(32)
 
 
+def hash_refresh_token(token: str) -> str:
+    """Hash a refresh token for storage and lookup"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def create_refresh_session(user: User, user_agent: Optional[str] = None) -> str:
+    """Store a new refresh session for the user and return the plain token"""
+    token = generate_refresh_token()
+    await RefreshSession(
+        token_hash=hash_refresh_token(token),
+        user_id=user.id,
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        user_agent=user_agent[:300] if user_agent else None,
+    ).insert()
+    return token
+
+
 @router.post("/login", response_model=TokenResponse)
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    await enforce_auth_rate_limit(request, "login", form_data.username)
     user = await User.find_one(User.username == form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    valid, new_hash = await run_password_job(
+        verify_and_update_password, form_data.password, user.hashed_password
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Transparently upgrade hashes created with a different rounds setting
+        user.hashed_password = new_hash
 
     # Generate access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -137,12 +349,11 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         data={"sub": user.username}, expires_delta=access_token_expires
     )
 
-    # Generate and store refresh token
-    refresh_token = generate_refresh_token()
-    user.refresh_token = refresh_token
-    user.refresh_token_expires = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    # Generate and store refresh token (one session per device)
+    refresh_token = await create_refresh_session(user, request.headers.get("user-agent"))
     user.last_login = datetime.utcnow()
     await user.save()
+    invalidate_cached_user(user.username)
 
     return TokenResponse(
         access_token=access_token,
@@ -181,15 +392,26 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
     )
 
 
+@router.post("/stream-token", response_model=StreamTokenResponse)
+async def create_stream_token(current_user: User = Depends(get_current_user)):
+    """Short-lived token that only opens the event stream (GET /tasks/events?stream_token=)"""
+    stream_token = create_access_token(
+        data={"sub": current_user.username, "scope": STREAM_TOKEN_SCOPE},
+        expires_delta=timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS)
+    )
+    return StreamTokenResponse(stream_token=stream_token, expires_in=STREAM_TOKEN_EXPIRE_SECONDS)
+
+
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(refresh_token: str):
+async def refresh_token(refresh_token: str, request: Request):
     """Get a new access token using a refresh token"""
     try:
-        # Find user with this refresh token
-        user = await User.find_one(
-            User.refresh_token == refresh_token,
-            User.refresh_token_expires > datetime.utcnow()
-        )
+        # Consume the session atomically so a token can only be rotated once
+        session = await RefreshSession.get_motor_collection().find_one_and_delete({
+            "token_hash": hash_refresh_token(refresh_token),
+            "expires_at": {"$gt": datetime.utcnow()}
+        })
+        user = await User.get(session["user_id"]) if session else None
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -204,10 +426,7 @@ async def refresh_token(refresh_token: str):
         )
 
         # Generate new refresh token (rotation)
-        new_refresh_token = generate_refresh_token()
-        user.refresh_token = new_refresh_token
-        user.refresh_token_expires = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-        await user.save()
+        new_refresh_token = await create_refresh_session(user, request.headers.get("user-agent"))
 
         return TokenResponse(
             access_token=access_token,
@@ -235,11 +454,19 @@ async def refresh_token(refresh_token: str):
 
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
-    """Logout user by invalidating their refresh token"""
-    current_user.refresh_token = None
-    current_user.refresh_token_expires = None
-    await current_user.save()
+async def logout(
+    refresh_token: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Logout by revoking the given refresh token, or every session of the user if none is given"""
+    query = {"user_id": current_user.id}
+    if refresh_token:
+        query["token_hash"] = hash_refresh_token(refresh_token)
+    await RefreshSession.get_motor_collection().delete_many(query)
     return {"message": "Successfully logged out"}
 
 
+@router.get("/cache-stats")
+async def get_user_cache_stats(_: User = Depends(require_admin)):
+    """Admin: Hit/miss counters for the authenticated-user cache"""
+    return user_cache.stats()
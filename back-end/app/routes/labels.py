@@ -1,26 +1,54 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
-from ..models.label import Label, LabelResponse, LabelCreate, LabelUpdate
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Union
+from datetime import datetime
+from ..models.label import Label, LabelResponse, LabelCreate, LabelUpdate, LabelWithTaskCount
+from ..models.task import Task
 from beanie import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
 from .auth import get_current_user, require_admin
 from ..models.user import User
+from ..database import database
+from ..serialization import DocumentSerializer, JSONBytesResponse, dumps
+from ..events import task_events
+from ..versions import TASKS, LABELS, bump_versions, get_versions, build_etag, etag_matches, not_modified, cache_headers
+from config import settings
 
 router = APIRouter(prefix="/labels", tags=["Labels"])
 
-@router.get("/", response_model=List[LabelResponse])
-async def get_my_labels(current_user: User = Depends(get_current_user)):
-    """Get labels for the current authenticated user"""
+# List responses are encoded straight from our own documents, skipping response validation
+label_serializer = DocumentSerializer(LabelResponse, Label)
+
+async def count_tasks_per_label(user_id: PydanticObjectId, label_ids: List[PydanticObjectId]) -> dict:
+    """Count the user's tasks carrying each label with one aggregation over tasks.label_ids"""
+    if not label_ids:
+        return {}
+    pipeline = [
+        {"$match": {"user_id": user_id, "label_ids": {"$in": label_ids}}},
+        {"$unwind": "$label_ids"},
+        {"$match": {"label_ids": {"$in": label_ids}}},
+        {"$group": {"_id": "$label_ids", "count": {"$sum": 1}}},
+    ]
+    # Served under the labels ETag, so read from the primary like its version counters
+    rows = await database.list_collection(Task, primary=True).aggregate(pipeline).to_list(length=None)
+    return {row["_id"]: row["count"] for row in rows}
+
+
+@router.get("/", response_model=Union[List[LabelWithTaskCount], List[LabelResponse]])
+async def get_my_labels(request: Request, with_counts: bool = False, current_user: User = Depends(get_current_user)):
+    """Get labels for the current authenticated user, optionally with task counts; supports If-None-Match"""
+    # Task counts change with task writes, so they are part of the version
+    scopes = (LABELS, TASKS) if with_counts else (LABELS,)
+    etag = build_etag(current_user.id, await get_versions(current_user.id, *scopes), request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     try:
-        labels = await Label.find(Label.user_id == current_user.id).to_list()
-        return [LabelResponse(
-            id=str(label.id),
-            name=label.name,
-            color=label.color,
-            description=label.description,
-            user_id=str(label.user_id),
-            created_at=label.created_at,
-            updated_at=label.updated_at
-        ) for label in labels]
+        docs = await database.list_collection(Label, primary=True).find({"user_id": current_user.id}).to_list(length=None)
+        if with_counts:
+            counts = await count_tasks_per_label(current_user.id, [doc["_id"] for doc in docs])
+            return JSONBytesResponse(dumps([
+                {**label_serializer.shape(doc), "task_count": counts.get(doc["_id"], 0)} for doc in docs
+            ]), headers=cache_headers(etag))
+        return JSONBytesResponse(label_serializer.dumps(docs), headers=cache_headers(etag))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
@@ -28,16 +56,8 @@ async def get_my_labels(current_user: User = Depends(get_current_user)):
 async def get_labels_by_user_admin(user_id: str, _: User = Depends(require_admin)):
     """Admin: Get all labels for a specific user"""
     try:
-        labels = await Label.find(Label.user_id == PydanticObjectId(user_id)).to_list()
-        return [LabelResponse(
-            id=str(label.id),
-            name=label.name,
-            color=label.color,
-            description=label.description,
-            user_id=str(label.user_id),
-            created_at=label.created_at,
-            updated_at=label.updated_at
-        ) for label in labels]
+        docs = await database.list_collection(Label).find({"user_id": PydanticObjectId(user_id)}).to_list(length=None)
+        return JSONBytesResponse(label_serializer.dumps(docs))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid user ID: {str(e)}")
 
@@ -72,21 +92,19 @@ async def create_label(
 ):
     """Create a new label for the current user"""
     try:
-        # Ensure unique label name per user
-        existing = await Label.find_one(
-            Label.user_id == current_user.id,
-            Label.name == label_data.name
-        )
-        if existing:
-            raise HTTPException(status_code=400, detail="Label name already exists for this user")
-
         label = Label(
             name=label_data.name,
             user_id=current_user.id,
             color=label_data.color,
             description=label_data.description
         )
-        await label.insert()
+        # The unique (user_id, name) index enforces one label name per user
+        try:
+            await label.insert()
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Label name already exists for this user")
+        await bump_versions(current_user.id, LABELS)
+        task_events.emit(current_user.id, "label.created", label_serializer.shape(label.model_dump(by_alias=True)))
 
         return LabelResponse(
             id=str(label.id),
@@ -117,15 +135,6 @@ async def update_label(
         if label.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to update this label")
 
-        # If name changes, ensure uniqueness per user
-        if label_data.name and label_data.name != label.name:
-            conflict = await Label.find_one(
-                Label.user_id == current_user.id,
-                Label.name == label_data.name
-            )
-            if conflict:
-                raise HTTPException(status_code=400, detail="Label name already exists for this user")
-
         if label_data.name is not None:
             label.name = label_data.name
         if label_data.color is not None:
@@ -133,7 +142,17 @@ async def update_label(
         if label_data.description is not None:
             label.description = label_data.description
 
-        await label.save()
+        # A rename onto an existing name is rejected by the unique (user_id, name) index.
+        # Write with update_one: Beanie's save() upserts and reports DuplicateKeyError as a revision conflict.
+        try:
+            await Label.get_motor_collection().update_one(
+                {"_id": label.id},
+                {"$set": {"name": label.name, "color": label.color, "description": label.description}}
+            )
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Label name already exists for this user")
+        await bump_versions(current_user.id, LABELS)
+        task_events.emit(current_user.id, "label.updated", label_serializer.shape(label.model_dump(by_alias=True)))
 
         return LabelResponse(
             id=str(label.id),
@@ -150,6 +169,27 @@ async def update_label(
         raise HTTPException(status_code=500, detail=f"Error updating label: {str(e)}")
 
 
+async def delete_label_and_scrub_tasks(label: Label) -> int:
+    """
+    Delete a label and pull its id from every task of the owner in one update_many.
+    Runs inside a transaction when LABEL_DELETE_USE_TRANSACTION is set (needs a replica set).
+    Returns the number of tasks that referenced the label.
+    """
+    tasks = Task.get_motor_collection()
+    scrub_filter = {"user_id": label.user_id, "label_ids": label.id}
+    scrub_update = {"$pull": {"label_ids": label.id}, "$set": {"updated_at": datetime.utcnow()}}
+
+    if settings.LABEL_DELETE_USE_TRANSACTION:
+        async with await database.client.start_session() as session:
+            async with session.start_transaction():
+                await label.delete(session=session)
+                result = await tasks.update_many(scrub_filter, scrub_update, session=session)
+    else:
+        await label.delete()
+        result = await tasks.update_many(scrub_filter, scrub_update)
+    return result.modified_count
+
+
 @router.delete("/{label_id}")
 async def delete_label(
     label_id: str,
@@ -163,8 +203,10 @@ async def delete_label(
         if label.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this label")
 
-        await label.delete()
-        return {"message": "Label deleted successfully"}
+        tasks_updated = await delete_label_and_scrub_tasks(label)
+        await bump_versions(current_user.id, LABELS, TASKS)
+        task_events.emit(current_user.id, "label.deleted", {"id": label.id, "tasks_updated": tasks_updated})
+        return {"message": "Label deleted successfully", "tasks_updated": tasks_updated}
     except HTTPException:
         raise
     except Exception as e:
@@ -1,54 +1,493 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
-from ..models.task import Task, TaskResponse, TaskStatus, PriorityLevel, TaskCreate, TaskUpdate
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional, Tuple, Union
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import base64
+import html
+import json
+import re
+from ..models.task import (
+    Task, TaskResponse, TaskWithLabels, TaskSummary, TaskStatus, PriorityLevel, TaskCreate, TaskUpdate, TaskFilter, TaskPage, TaskStats,
+    BulkOperationType, TaskBulkRequest, TaskBulkItemResult, TaskBulkResponse, TaskSearchHit, TaskSearchPage,
+    TaskAgenda
+)
 from beanie import PydanticObjectId
-from .auth import get_current_user
+from beanie.odm.utils.dump import get_dict
+from pymongo import ASCENDING, DESCENDING, InsertOne, UpdateOne, DeleteOne, ReturnDocument
+from pymongo.errors import BulkWriteError
+from .auth import get_current_user, get_stream_user
 from ..models.user import User
+from ..models.label import Label, LabelResponse
+from ..cache import TTLCache
+from ..serialization import DocumentSerializer, JSONBytesResponse, dumps, dumps_lines
+from ..events import task_events, stream_events
+from ..scheduler import deadline_scheduler
+from ..versions import TASKS, LABELS, bump_versions, get_versions, build_etag, etag_matches, not_modified, cache_headers
+from ..database import database
+from config import settings
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
-@router.get("/", response_model=List[TaskResponse])
-async def get_all_tasks():
-    """Get all tasks"""
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Fields loaded for view=summary; everything else stays on the server
+TASK_SUMMARY_PROJECTION = {"title": 1, "priority": 1, "deadline": 1, "status": 1, "label_ids": 1}
+
+TaskView = Literal["full", "summary"]
+
+# Widest window GET /tasks/agenda serves in one request
+AGENDA_MAX_DAYS = 92
+
+# List responses are encoded straight from our own documents, skipping response validation
+task_response_serializer = DocumentSerializer(TaskResponse, Task)
+task_summary_serializer = DocumentSerializer(TaskSummary, Task)
+
+# Dashboard statistics keyed by user ID; dropped whenever that user's tasks change
+task_stats_cache = TTLCache(
+    max_size=settings.TASK_STATS_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TASK_STATS_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_task_stats(user_id: PydanticObjectId) -> None:
+    """Drop cached statistics after a write to the user's tasks"""
+    task_stats_cache.invalidate(user_id)
+
+
+def task_to_response(task: Task) -> TaskResponse:
+    """Convert a Task document into its API response schema"""
+    return TaskResponse(
+        id=str(task.id),
+        title=task.title,
+        description=task.description,
+        priority=task.priority,
+        deadline=task.deadline,
+        status=task.status,
+        label_ids=[str(label_id) for label_id in task.label_ids],
+        user_id=str(task.user_id),
+        created_at=task.created_at,
+        updated_at=task.updated_at,
+        completed_at=task.completed_at,
+        overdue_at=task.overdue_at
+    )
+
+
+async def hydrate_labels(tasks: List[Task]) -> List[TaskWithLabels]:
+    """
+    Attach full label objects to a page of tasks.
+    All labels referenced by the page are fetched with one $in query and
+    joined in memory. Only labels owned by the task's owner are attached;
+    ids of deleted or foreign labels are skipped.
+    """
+    label_ids = {label_id for task in tasks for label_id in task.label_ids}
+    owner_ids = {task.user_id for task in tasks}
+    label_map = {}
+    if label_ids:
+        labels = await Label.find({"_id": {"$in": list(label_ids)}, "user_id": {"$in": list(owner_ids)}}).to_list()
+        label_map = {(label.user_id, label.id): LabelResponse(
+            id=str(label.id),
+            name=label.name,
+            color=label.color,
+            description=label.description,
+            user_id=str(label.user_id),
+            created_at=label.created_at,
+            updated_at=label.updated_at
+        ).model_dump() for label in labels}
+    return [TaskWithLabels(
+        **task_to_response(task).model_dump(),
+        labels=[
+            label_map[(task.user_id, label_id)] for label_id in task.label_ids
+            if (task.user_id, label_id) in label_map
+        ]
+    ) for task in tasks]
+
+
+def task_projection(view: str) -> Optional[dict]:
+    """Mongo projection for the requested view (None loads full documents)"""
+    return TASK_SUMMARY_PROJECTION if view == "summary" else None
+
+
+async def docs_to_items(docs: List[dict], expand: Optional[str], view: str = "full") -> list:
+    """
+    Shape a page of raw task documents for the requested view.
+    Plain listings are shaped straight from BSON; only expand=labels builds models.
+    """
+    if expand == "labels":
+        return await hydrate_labels([Task.model_validate(doc) for doc in docs])
+    serializer = task_summary_serializer if view == "summary" else task_response_serializer
+    return [serializer.shape(doc) for doc in docs]
+
+
+def check_view_options(view: str, expand: Optional[str]) -> None:
+    """Reject option combinations the summary view cannot serve"""
+    if view == "summary" and expand:
+        raise HTTPException(status_code=400, detail="expand is not supported with view=summary")
+
+
+def emit_task_event(user_id: PydanticObjectId, event: str, doc: dict) -> None:
+    """Push a change to the user's live feed (GET /tasks/events); deletes carry only the id"""
+    data = {"id": doc["_id"]} if event == "task.deleted" else task_response_serializer.shape(doc)
+    task_events.emit(user_id, event, data)
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Whether the client opted into streaming via the Accept header"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def stream_tasks_ndjson(
+    query: dict,
+    batch_size: int,
+    expand: Optional[str] = None,
+    view: str = "full",
+    primary: bool = False
+):
+    """
+    Iterate the Motor cursor and emit one JSON task per line.
+    Lines are flushed once per cursor batch so memory stays flat.
+    primary=True reads from the primary (for responses carrying an ETag).
+    """
+    cursor = database.list_collection(Task, primary=primary).find(query, task_projection(view), batch_size=batch_size)
+    batch = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield dumps_lines(await docs_to_items(batch, expand, view))
+            batch = []
+    if batch:
+        yield dumps_lines(await docs_to_items(batch, expand, view))
+
+
+def build_task_query(user_id: PydanticObjectId, filters: TaskFilter) -> dict:
+    """Translate a TaskFilter into a single Mongo query scoped to one user"""
+    query: dict = {"user_id": user_id}
+    if filters.status is not None:
+        query["status"] = filters.status.value
+    if filters.priority is not None:
+        query["priority"] = filters.priority.value
+    if filters.label_ids:
+        # Tasks must carry every selected label (matches the frontend label filter)
+        query["label_ids"] = {"$all": [PydanticObjectId(x) for x in filters.label_ids]}
+    if filters.deadline_from is not None or filters.deadline_to is not None:
+        deadline_range = {}
+        if filters.deadline_from is not None:
+            deadline_range["$gte"] = filters.deadline_from
+        if filters.deadline_to is not None:
+            deadline_range["$lte"] = filters.deadline_to
+        query["deadline"] = deadline_range
+    if filters.search:
+        # Served by the (user_id, title, description) text index
+        query["$text"] = {"$search": filters.search}
+    return query
+
+
+def build_snippet(task: Task, search: str, width: int = 60) -> Optional[str]:
+    """Excerpt the first match of any search term, wrapping matches in <mark> tags"""
+    terms = [t for t in re.findall(r"\w+", search) if len(t) > 1]
+    if not terms:
+        return None
+    pattern = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE)
+    for text in (task.description, task.title):
+        if not text:
+            continue
+        match = pattern.search(text)
+        if match is None:
+            continue
+        start = max(match.start() - width, 0)
+        end = min(match.end() + width, len(text))
+        excerpt, pos = "", start
+        for m in pattern.finditer(text, start, end):
+            excerpt += html.escape(text[pos:m.start()]) + f"<mark>{html.escape(m.group(0))}</mark>"
+            pos = m.end()
+        excerpt += html.escape(text[pos:end])
+        return ("…" if start > 0 else "") + excerpt + ("…" if end < len(text) else "")
+    return None
+
+
+def encode_task_cursor(deadline: datetime, task_id) -> str:
+    """Encode the (deadline, _id) keyset position of a task as an opaque cursor"""
+    raw = json.dumps({"deadline": deadline.isoformat(), "id": str(task_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_task_cursor(cursor: str) -> Tuple[datetime, PydanticObjectId]:
+    """Decode a cursor produced by encode_task_cursor"""
+    raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return datetime.fromisoformat(raw["deadline"]), PydanticObjectId(raw["id"])
+
+
+@router.get("/", response_model=Union[List[TaskWithLabels], List[TaskResponse], List[TaskSummary]])
+async def get_all_tasks(
+    request: Request,
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+    expand: Optional[Literal["labels"]] = None,
+    view: TaskView = "full"
+):
+    """Get all tasks (send Accept: application/x-ndjson to stream, expand=labels to embed labels, view=summary for slim items)"""
+    check_view_options(view, expand)
+    if wants_ndjson(request):
+        return StreamingResponse(
+            stream_tasks_ndjson({}, batch_size or settings.STREAM_BATCH_SIZE, expand, view),
+            media_type=NDJSON_MEDIA_TYPE
+        )
     try:
-        tasks = await Task.find_all().to_list()
-        # Convert to response format manually
-        return [TaskResponse(
-            id=str(task.id),
-            title=task.title,
-            description=task.description,
-            priority=task.priority,
-            deadline=task.deadline,
-            status=task.status,
-            label_ids=[str(label_id) for label_id in task.label_ids],
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-            completed_at=task.completed_at
-        ) for task in tasks]
+        docs = await database.list_collection(Task).find({}, task_projection(view)).to_list(length=None)
+        return JSONBytesResponse(dumps(await docs_to_items(docs, expand, view)))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-@router.get("/user/{user_id}", response_model=List[TaskResponse])
-async def get_user_tasks(user_id: str):
-    """Get all tasks for a specific user"""
+@router.get("/user/{user_id}", response_model=Union[List[TaskWithLabels], List[TaskResponse], List[TaskSummary]])
+async def get_user_tasks(
+    user_id: str,
+    request: Request,
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+    expand: Optional[Literal["labels"]] = None,
+    view: TaskView = "full"
+):
+    """
+    Get all tasks for a specific user (send Accept: application/x-ndjson to stream, expand=labels to embed labels, view=summary for slim items).
+    Responses carry an ETag; If-None-Match is answered with 304 from the user's version counter alone.
+    """
+    check_view_options(view, expand)
     try:
-        tasks = await Task.find(Task.user_id == PydanticObjectId(user_id)).to_list()
-        return [TaskResponse(
-            id=str(task.id),
-            title=task.title,
-            description=task.description,
-            priority=task.priority,
-            deadline=task.deadline,
-            status=task.status,
-            label_ids=[str(label_id) for label_id in task.label_ids],
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-            completed_at=task.completed_at
-        ) for task in tasks]
+        owner_id = PydanticObjectId(user_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid user ID: {str(e)}")
+    scopes = (TASKS, LABELS) if expand == "labels" else (TASKS,)
+    etag = build_etag(owner_id, await get_versions(owner_id, *scopes), request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    query = {"user_id": owner_id}
+    if wants_ndjson(request):
+        return StreamingResponse(
+            stream_tasks_ndjson(query, batch_size or settings.STREAM_BATCH_SIZE, expand, view, primary=True),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=cache_headers(etag)
+        )
+    try:
+        docs = await database.list_collection(Task, primary=True).find(query, task_projection(view)).to_list(length=None)
+        return JSONBytesResponse(dumps(await docs_to_items(docs, expand, view)), headers=cache_headers(etag))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid user ID: {str(e)}")
+
+@router.get("/query", response_model=TaskPage)
+async def query_tasks(
+    request: Request,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[PriorityLevel] = None,
+    label_ids: Optional[List[str]] = Query(None),
+    deadline_from: Optional[datetime] = None,
+    deadline_to: Optional[datetime] = None,
+    search: Optional[str] = None,
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    expand: Optional[Literal["labels"]] = None,
+    view: TaskView = "full",
+    current_user: User = Depends(get_current_user)
+):
+    """Filter, sort and paginate the current user's tasks by (deadline, id); supports If-None-Match"""
+    check_view_options(view, expand)
+    scopes = (TASKS, LABELS) if expand == "labels" else (TASKS,)
+    etag = build_etag(current_user.id, await get_versions(current_user.id, *scopes), request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    try:
+        filters = TaskFilter(
+            status=status,
+            priority=priority,
+            label_ids=label_ids,
+            deadline_from=deadline_from,
+            deadline_to=deadline_to,
+            search=search
+        )
+        query = build_task_query(current_user.id, filters)
+
+        op = "$gt" if order == "asc" else "$lt"
+        if cursor:
+            after_deadline, after_id = decode_task_cursor(cursor)
+            query = {"$and": [query, {"$or": [
+                {"deadline": {op: after_deadline}},
+                {"deadline": after_deadline, "_id": {op: after_id}},
+            ]}]}
+
+        direction = ASCENDING if order == "asc" else DESCENDING
+        # Fetch one extra document to know whether another page exists
+        docs = await database.list_collection(Task, primary=True).find(query, task_projection(view)).sort(
+            [("deadline", direction), ("_id", direction)]
+        ).limit(limit + 1).to_list(length=limit + 1)
+
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_task_cursor(docs[-1]["deadline"], docs[-1]["_id"])
+
+        return JSONBytesResponse(dumps({
+            "items": await docs_to_items(docs, expand, view),
+            "next_cursor": next_cursor
+        }), headers=cache_headers(etag))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid query parameters: {str(e)}")
+
+async def compute_task_stats(user_id: PydanticObjectId) -> TaskStats:
+    """Compute all task counters for a user with one $facet aggregation"""
+    closed = [TaskStatus.COMPLETED.value, TaskStatus.CANCELLED.value]
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$facet": {
+            "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "by_priority": [{"$group": {"_id": "$priority", "count": {"$sum": 1}}}],
+            "overdue": [
+                {"$match": {"deadline": {"$lt": datetime.utcnow()}, "status": {"$nin": closed}}},
+                {"$count": "count"}
+            ],
+        }},
+    ]
+    # Read from the primary: the result is cached until the next write
+    # invalidates it, so a lagging secondary would pin stale counters
+    result = (await database.list_collection(Task, primary=True).aggregate(pipeline).to_list(length=1))[0]
+
+    by_status = {s.value: 0 for s in TaskStatus}
+    by_status.update({row["_id"]: row["count"] for row in result["by_status"]})
+    by_priority = {p.value: 0 for p in PriorityLevel}
+    by_priority.update({row["_id"]: row["count"] for row in result["by_priority"]})
+
+    return TaskStats(
+        total_tasks=sum(by_status.values()),
+        completed_tasks=by_status[TaskStatus.COMPLETED.value],
+        pending_tasks=by_status[TaskStatus.TODO.value] + by_status[TaskStatus.IN_PROGRESS.value],
+        overdue_tasks=result["overdue"][0]["count"] if result["overdue"] else 0,
+        tasks_by_priority=by_priority,
+        tasks_by_status=by_status
+    )
+
+
+@router.get("/search", response_model=TaskSearchPage)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    current_user: User = Depends(get_current_user)
+):
+    """Full-text search over the current user's task titles and descriptions, ranked by relevance"""
+    try:
+        score = {"$meta": "textScore"}
+        cursor = database.list_collection(Task).find(
+            {"user_id": current_user.id, "$text": {"$search": q}},
+            {"score": score}
+        ).sort([("score", score)]).skip(offset).limit(limit + 1)
+        docs = await cursor.to_list(length=limit + 1)
+
+        next_offset = offset + limit if len(docs) > limit else None
+        items = []
+        for doc in docs[:limit]:
+            relevance = doc.pop("score")
+            task = Task.model_validate(doc)
+            items.append(TaskSearchHit(
+                **task_to_response(task).model_dump(),
+                score=relevance,
+                snippet=build_snippet(task, q)
+            ))
+        return TaskSearchPage(items=items, next_offset=next_offset)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid search: {str(e)}")
+
+
+@router.get("/stats", response_model=TaskStats)
+async def get_task_stats(current_user: User = Depends(get_current_user)):
+    """Get task counters for the current user (cached briefly)"""
+    try:
+        stats = task_stats_cache.get(current_user.id)
+        if stats is None:
+            stats = await compute_task_stats(current_user.id)
+            task_stats_cache.set(current_user.id, stats)
+        return stats
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+def local_midnight_utc(day: date, tz: ZoneInfo) -> datetime:
+    """Start of a local calendar day as a naive UTC datetime, as deadlines are stored"""
+    return datetime.combine(day, datetime.min.time(), tzinfo=tz).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@router.get("/agenda", response_model=TaskAgenda)
+async def get_task_agenda(
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    tz: str = "UTC",
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Tasks due between two local dates (inclusive), bucketed by local day in tz.
+    Only the window is read, via the (user_id, deadline) index; buckets and
+    counts are built server-side with $dateTrunc.
+    """
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown time zone: {tz}")
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    days = (to_date - from_date).days + 1
+    if days > AGENDA_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Agenda window is limited to {AGENDA_MAX_DAYS} days")
+
+    try:
+        start = local_midnight_utc(from_date, zone)
+        end = local_midnight_utc(to_date + timedelta(days=1), zone)
+        pipeline = [
+            {"$match": {"user_id": current_user.id, "deadline": {"$gte": start, "$lt": end}}},
+            {"$sort": {"deadline": 1, "_id": 1}},
+            {"$group": {
+                "_id": {"$dateTrunc": {"date": "$deadline", "unit": "day", "timezone": tz}},
+                "count": {"$sum": 1},
+                "tasks": {"$push": {"_id": "$_id", **{field: f"${field}" for field in TASK_SUMMARY_PROJECTION}}},
+            }},
+        ]
+        rows = await database.list_collection(Task).aggregate(pipeline).to_list(length=None)
+
+        # Bucket keys are local midnights in UTC; report them as local dates and fill empty days
+        buckets = {
+            row["_id"].replace(tzinfo=timezone.utc).astimezone(zone).date(): row
+            for row in rows
+        }
+        agenda_days = []
+        for offset in range(days):
+            day = from_date + timedelta(days=offset)
+            row = buckets.get(day)
+            agenda_days.append({
+                "date": day,
+                "count": row["count"] if row else 0,
+                "tasks": [task_summary_serializer.shape(doc) for doc in row["tasks"]] if row else [],
+            })
+        return JSONBytesResponse(dumps({
+            "from_date": from_date,
+            "to_date": to_date,
+            "tz": tz,
+            "total": sum(day["count"] for day in agenda_days),
+            "days": agenda_days,
+        }))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building agenda: {str(e)}")
+
+
+@router.get("/events")
+async def task_event_feed(current_user: User = Depends(get_stream_user)):
+    """
+    Server-Sent Events feed of the current user's task and label changes
+    (task.created/updated/deleted, tasks.bulk, label.*). Authenticate with a
+    Bearer header or, for EventSource, ?stream_token= from POST /auth/stream-token.
+    Task events carry the full task as listed by the API. A resync event means
+    events were dropped and the client should refetch.
+    """
+    return StreamingResponse(
+        stream_events(current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(task_id: str):
@@ -57,19 +496,7 @@ async def get_task(task_id: str):
         task = await Task.get(PydanticObjectId(task_id))
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
-        return TaskResponse(
-            id=str(task.id),
-            title=task.title,
-            description=task.description,
-            priority=task.priority,
-            deadline=task.deadline,
-            status=task.status,
-            label_ids=[str(label_id) for label_id in task.label_ids],
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-            completed_at=task.completed_at
-        )
+        return task_to_response(task)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid task ID: {str(e)}")
 
@@ -77,11 +504,10 @@ async def get_task(task_id: str):
 async def get_user_tasks_by_status(user_id: str, status: TaskStatus):
     """Get tasks for a specific user filtered by status"""
     try:
-        tasks = await Task.find(
-            Task.user_id == PydanticObjectId(user_id),
-            Task.status == status
-        ).to_list()
-        return tasks
+        docs = await database.list_collection(Task).find(
+            {"user_id": PydanticObjectId(user_id), "status": status.value}
+        ).to_list(length=None)
+        return JSONBytesResponse(task_response_serializer.dumps(docs))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid parameters: {str(e)}")
 
@@ -103,23 +529,216 @@ async def create_task(
             label_ids=[PydanticObjectId(x) for x in (task_data.label_ids or [])]
         )
         await task.insert()
-        return TaskResponse(
-            id=str(task.id),
-            title=task.title,
-            description=task.description,
-            priority=task.priority,
-            deadline=task.deadline,
-            status=task.status,
-            label_ids=[str(label_id) for label_id in task.label_ids],
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-            completed_at=task.completed_at
-        )
+        invalidate_task_stats(current_user.id)
+        await bump_versions(current_user.id, TASKS)
+        emit_task_event(current_user.id, "task.created", task.model_dump(by_alias=True))
+        deadline_scheduler.notify(task.id, task.deadline)
+        return task_to_response(task)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating task: {str(e)}")
 
 
+def build_task_update(task_data: TaskUpdate) -> list:
+    """
+    Build an update pipeline for the non-null fields of a TaskUpdate.
+    Values are wrapped in $literal so user strings are never read as field paths.
+    """
+    fields = {}
+    if task_data.title is not None:
+        fields["title"] = task_data.title
+    if task_data.description is not None:
+        fields["description"] = task_data.description
+    if task_data.priority is not None:
+        fields["priority"] = task_data.priority.value
+    if task_data.deadline is not None:
+        fields["deadline"] = task_data.deadline
+        fields["overdue_at"] = None  # the scheduler re-evaluates the new deadline
+    if task_data.status is not None:
+        fields["status"] = task_data.status.value
+    if task_data.label_ids is not None:
+        fields["label_ids"] = [PydanticObjectId(x) for x in task_data.label_ids]
+    fields["updated_at"] = datetime.utcnow()
+
+    pipeline = [{"$set": {key: {"$literal": value} for key, value in fields.items()}}]
+    if task_data.status == TaskStatus.COMPLETED:
+        pipeline.append({"$set": {"completed_at": {"$ifNull": ["$completed_at", "$deadline"]}}})
+    return pipeline
+
+
+async def apply_task_update(task_id: str, user_id: PydanticObjectId, update) -> Task:
+    """
+    Atomically apply an update to a task owned by user_id and return the new document.
+    Raises 404 if the task does not exist and 403 if it belongs to someone else.
+    """
+    oid = PydanticObjectId(task_id)
+    collection = Task.get_motor_collection()
+    doc = await collection.find_one_and_update(
+        {"_id": oid, "user_id": user_id},
+        update,
+        return_document=ReturnDocument.AFTER
+    )
+    if doc is None:
+        if await collection.count_documents({"_id": oid}, limit=1):
+            raise HTTPException(status_code=403, detail="Not authorized to update this task")
+        raise HTTPException(status_code=404, detail="Task not found")
+    invalidate_task_stats(user_id)
+    await bump_versions(user_id, TASKS)
+    emit_task_event(user_id, "task.updated", doc)
+    deadline_scheduler.notify(doc["_id"], doc["deadline"])
+    return Task.model_validate(doc)
+
+
+async def existing_task_deadlines(collection, user_id: PydanticObjectId, task_ids: list) -> dict:
+    """Current deadlines of the given tasks of user_id that still exist, with one $in query"""
+    if not task_ids:
+        return {}
+    cursor = collection.find({"_id": {"$in": task_ids}, "user_id": user_id}, {"deadline": 1})
+    return {doc["_id"]: doc["deadline"] async for doc in cursor}
+
+
+def mark_unmatched_bulk_targets(results: list, updated_existing: dict, removed: int) -> None:
+    """
+    Fail bulk updates/deletes whose task was deleted concurrently after the
+    ownership read, so they matched nothing. An updated task that still exists
+    was matched (ids are never reused). Deletes leave nothing to re-check, so
+    when fewer documents were removed than attempted every delete of the batch
+    is reported as failed; the tasks are gone either way.
+    """
+    for result in results:
+        if result.success and result.op == BulkOperationType.UPDATE and PydanticObjectId(result.task_id) not in updated_existing:
+            result.success = False
+            result.error = "Task not found"
+    deletes = [r for r in results if r.success and r.op == BulkOperationType.DELETE]
+    if removed < len(deletes):
+        for result in deletes:
+            result.success = False
+            result.error = "Task not found"
+
+
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def bulk_tasks(
+    payload: TaskBulkRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Apply many create/update/delete operations with a single bulk write"""
+    # Validate every operation before anything is written
+    errors = []
+    target_ids = {}
+    first_seen = {}  # task id -> index of the first operation targeting it
+    for index, item in enumerate(payload.operations):
+        try:
+            if item.op == BulkOperationType.CREATE:
+                if item.create is None:
+                    raise ValueError("'create' is required for create operations")
+                [PydanticObjectId(x) for x in item.create.label_ids]
+            else:
+                if not item.task_id:
+                    raise ValueError(f"'task_id' is required for {item.op.value} operations")
+                target_ids[index] = PydanticObjectId(item.task_id)
+                # Unordered bulk writes regroup ops by type, so several ops on
+                # one task would not run in request order
+                if target_ids[index] in first_seen:
+                    raise ValueError(f"task_id already targeted by operation {first_seen[target_ids[index]]}")
+                first_seen[target_ids[index]] = index
+                if item.op == BulkOperationType.UPDATE:
+                    if item.update is None:
+                        raise ValueError("'update' is required for update operations")
+                    [PydanticObjectId(x) for x in (item.update.label_ids or [])]
+        except Exception as e:
+            errors.append({"index": index, "error": str(e)})
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
+
+    try:
+        collection = Task.get_motor_collection()
+
+        # Ownership check for all targeted tasks in one query
+        owned = set()
+        if target_ids:
+            cursor = collection.find(
+                {"_id": {"$in": list(set(target_ids.values()))}, "user_id": current_user.id},
+                {"_id": 1}
+            )
+            owned = {doc["_id"] async for doc in cursor}
+
+        results = []
+        requests = []
+        request_index = []  # position in `requests` -> position in `results`
+        deadlines = {}  # position in `results` -> deadline of a created task, for the scheduler
+        for index, item in enumerate(payload.operations):
+            result = TaskBulkItemResult(index=index, op=item.op, success=True)
+            if item.op == BulkOperationType.CREATE:
+                task = Task(
+                    title=item.create.title,
+                    description=item.create.description,
+                    user_id=current_user.id,
+                    priority=item.create.priority,
+                    deadline=item.create.deadline,
+                    status=TaskStatus.TODO,
+                    label_ids=[PydanticObjectId(x) for x in item.create.label_ids]
+                )
+                task.id = PydanticObjectId()
+                result.task_id = str(task.id)
+                deadlines[len(results)] = task.deadline
+                requests.append(InsertOne(get_dict(task, to_db=True)))
+            else:
+                task_id = target_ids[index]
+                result.task_id = str(task_id)
+                if task_id not in owned:
+                    result.success = False
+                    result.error = "Task not found"
+                    results.append(result)
+                    continue
+                selector = {"_id": task_id, "user_id": current_user.id}
+                if item.op == BulkOperationType.UPDATE:
+                    requests.append(UpdateOne(selector, build_task_update(item.update)))
+                else:
+                    requests.append(DeleteOne(selector))
+            request_index.append(len(results))
+            results.append(result)
+
+        if requests:
+            try:
+                write_result = (await collection.bulk_write(requests, ordered=False)).bulk_api_result
+            except BulkWriteError as e:
+                write_result = e.details
+                for write_error in e.details.get("writeErrors", []):
+                    failed = results[request_index[write_error["index"]]]
+                    failed.success = False
+                    failed.error = write_error.get("errmsg", "Write failed")
+            updated_deadlines = await existing_task_deadlines(collection, current_user.id, [
+                PydanticObjectId(r.task_id) for r in results if r.success and r.op == BulkOperationType.UPDATE
+            ])
+            mark_unmatched_bulk_targets(results, updated_deadlines, write_result.get("nRemoved", 0))
+            # Any update (e.g. a status change) can change what the scheduler should do
+            for task_id, deadline in updated_deadlines.items():
+                deadline_scheduler.notify(task_id, deadline)
+            invalidate_task_stats(current_user.id)
+            await bump_versions(current_user.id, TASKS)
+
+        for position, deadline in deadlines.items():
+            if results[position].success:
+                deadline_scheduler.notify(PydanticObjectId(results[position].task_id), deadline)
+
+        succeeded = [r for r in results if r.success]
+        if succeeded:
+            # One event for the whole batch; clients refetch what they display
+            task_events.emit(current_user.id, "tasks.bulk", {
+                op.value: [r.task_id for r in succeeded if r.op == op] for op in BulkOperationType
+            })
+        return TaskBulkResponse(
+            created=sum(1 for r in succeeded if r.op == BulkOperationType.CREATE),
+            updated=sum(1 for r in succeeded if r.op == BulkOperationType.UPDATE),
+            deleted=sum(1 for r in succeeded if r.op == BulkOperationType.DELETE),
+            failed=len(results) - len(succeeded),
+            results=results
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error applying bulk operations: {str(e)}")
+
+
 @router.patch("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: str,
@@ -128,43 +747,8 @@ async def update_task(
 ):
     """Update fields on an existing task owned by the current user"""
     try:
-        task = await Task.get(PydanticObjectId(task_id))
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-        if task.user_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not authorized to update this task")
-
-        if task_data.title is not None:
-            task.title = task_data.title
-        if task_data.description is not None:
-            task.description = task_data.description
-        if task_data.priority is not None:
-            task.priority = task_data.priority
-        if task_data.deadline is not None:
-            task.deadline = task_data.deadline
-        if task_data.status is not None:
-            task.status = task_data.status
-            if task_data.status == TaskStatus.COMPLETED and task.completed_at is None:
-                task.completed_at = task.deadline if task.deadline else task.created_at
-        if task_data.label_ids is not None:
-            task.label_ids = [PydanticObjectId(x) for x in task_data.label_ids]
-
-        task.updated_at = task.updated_at  # keep existing updated_at or set explicitly elsewhere
-        await task.save()
-
-        return TaskResponse(
-            id=str(task.id),
-            title=task.title,
-            description=task.description,
-            priority=task.priority,
-            deadline=task.deadline,
-            status=task.status,
-            label_ids=[str(label_id) for label_id in task.label_ids],
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-            completed_at=task.completed_at
-        )
+        task = await apply_task_update(task_id, current_user.id, build_task_update(task_data))
+        return task_to_response(task)
     except HTTPException:
         raise
     except Exception as e:
@@ -184,6 +768,9 @@ async def delete_task(
         if task.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this task")
         await task.delete()
+        invalidate_task_stats(current_user.id)
+        await bump_versions(current_user.id, TASKS)
+        emit_task_event(current_user.id, "task.deleted", {"_id": task.id})
         return {"message": "Task deleted successfully"}
     except HTTPException:
         raise
@@ -199,28 +786,13 @@ async def replace_task_labels(
 ):
     """Replace all labels on a task"""
     try:
-        label_ids = payload.get("label_ids", [])
-        task = await Task.get(PydanticObjectId(task_id))
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-        if task.user_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not authorized to update this task")
-
-        task.label_ids = [PydanticObjectId(x) for x in label_ids]
-        await task.save()
-        return TaskResponse(
-            id=str(task.id),
-            title=task.title,
-            description=task.description,
-            priority=task.priority,
-            deadline=task.deadline,
-            status=task.status,
-            label_ids=[str(label_id) for label_id in task.label_ids],
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-            completed_at=task.completed_at
+        label_ids = [PydanticObjectId(x) for x in payload.get("label_ids", [])]
+        task = await apply_task_update(
+            task_id,
+            current_user.id,
+            {"$set": {"label_ids": label_ids, "updated_at": datetime.utcnow()}}
         )
+        return task_to_response(task)
     except HTTPException:
         raise
     except Exception as e:
@@ -235,30 +807,15 @@ async def add_task_label(
 ):
     """Add a single label to a task"""
     try:
-        task = await Task.get(PydanticObjectId(task_id))
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-        if task.user_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not authorized to update this task")
-
-        pid = PydanticObjectId(label_id)
-        if pid not in task.label_ids:
-            task.label_ids.append(pid)
-            await task.save()
-
-        return TaskResponse(
-            id=str(task.id),
-            title=task.title,
-            description=task.description,
-            priority=task.priority,
-            deadline=task.deadline,
-            status=task.status,
-            label_ids=[str(x) for x in task.label_ids],
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-            completed_at=task.completed_at
+        task = await apply_task_update(
+            task_id,
+            current_user.id,
+            {
+                "$addToSet": {"label_ids": PydanticObjectId(label_id)},
+                "$set": {"updated_at": datetime.utcnow()}
+            }
         )
+        return task_to_response(task)
     except HTTPException:
         raise
     except Exception as e:
@@ -273,29 +830,15 @@ async def remove_task_label(
 ):
     """Remove a single label from a task"""
     try:
-        task = await Task.get(PydanticObjectId(task_id))
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-        if task.user_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not authorized to update this task")
-
-        pid = PydanticObjectId(label_id)
-        task.label_ids = [x for x in task.label_ids if x != pid]
-        await task.save()
-
-        return TaskResponse(
-            id=str(task.id),
-            title=task.title,
-            description=task.description,
-            priority=task.priority,
-            deadline=task.deadline,
-            status=task.status,
-            label_ids=[str(x) for x in task.label_ids],
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-            completed_at=task.completed_at
+        task = await apply_task_update(
+            task_id,
+            current_user.id,
+            {
+                "$pull": {"label_ids": PydanticObjectId(label_id)},
+                "$set": {"updated_at": datetime.utcnow()}
+            }
         )
+        return task_to_response(task)
     except HTTPException:
         raise
     except Exception as e:
@@ -305,10 +848,9 @@ async def remove_task_label(
 async def get_user_tasks_by_priority(user_id: str, priority: PriorityLevel):
     """Get tasks for a specific user filtered by priority"""
     try:
-        tasks = await Task.find(
-            Task.user_id == PydanticObjectId(user_id),
-            Task.priority == priority
-        ).to_list()
-        return tasks
+        docs = await database.list_collection(Task).find(
+            {"user_id": PydanticObjectId(user_id), "priority": priority.value}
+        ).to_list(length=None)
+        return JSONBytesResponse(task_response_serializer.dumps(docs))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid parameters: {str(e)}")
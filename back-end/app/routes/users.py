@@ -2,9 +2,14 @@ from fastapi import APIRouter, HTTPException
 from typing import List
 from ..models.user import User, UserResponse
 from beanie import PydanticObjectId
+from ..database import database
+from ..serialization import DocumentSerializer, JSONBytesResponse
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+user_serializer = DocumentSerializer(UserResponse, User)
+USER_RESPONSE_PROJECTION = {name: 1 for name in user_serializer.fields}
+
 @router.get("/test")
 async def test_users():
     """Test endpoint to debug"""
@@ -40,21 +45,9 @@ async def get_users_raw():
 async def get_all_users():
     """Get all users"""
     try:
-        users = await User.find_all().to_list()
-        # Convert to response format manually
-        return [UserResponse(
-            id=str(user.id),
-            email=user.email,
-            username=user.username,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            phone_number=user.phone_number,
-            is_active=user.is_active,
-            is_verified=user.is_verified,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-            last_login=user.last_login
-        ) for user in users]
+        # Project away credentials and encode straight from BSON
+        docs = await database.list_collection(User).find({}, USER_RESPONSE_PROJECTION).to_list(length=None)
+        return JSONBytesResponse(user_serializer.dumps(docs))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
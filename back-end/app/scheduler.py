@@ -0,0 +1,216 @@
+import asyncio
+import heapq
+import itertools
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+
+from config import settings
+from .models.task import Task, TaskStatus
+from .events import task_events
+from .versions import TASKS, bump_versions_many
+
+
+# Only these statuses can become overdue or get reminders
+OPEN_STATUSES = [TaskStatus.TODO.value, TaskStatus.IN_PROGRESS.value]
+
+REMINDER = "reminder"
+OVERDUE = "overdue"
+
+
+class DeadlineScheduler:
+    """
+    Marks tasks overdue when their deadline passes and emits reminder events
+    shortly before it, without periodic collection scans.
+
+    Upcoming deadlines live in a bounded min-heap filled in deadline order
+    from the deadline index. Every open, not-yet-overdue task with a deadline
+    up to the horizon is in the heap; the horizon advances one batch at a time
+    as the heap drains, so memory stays at TASK_SCHEDULER_HEAP_SIZE however
+    many tasks exist. The loop sleeps until the earliest entry is due.
+    Heap entries are hints: due entries are re-checked against the database,
+    so entries made stale by later writes are dropped there. Each task's
+    newest entries are tracked so superseded ones can be skipped and
+    compacted away when writes push the heap past its bound.
+    Events are published directly whatever TASK_EVENTS_SOURCE is, since
+    reminders are not database writes a change stream could pick up; they
+    reach clients connected to the process running the scheduler.
+    """
+
+    def __init__(self):
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._horizon: Optional[datetime] = None
+        self._horizon_ids: Set = set()  # tasks already loaded at exactly the horizon deadline
+        self._latest: Dict = {}  # task id -> generation of its current heap entries
+        self._wakeup: Optional[asyncio.Event] = None
+        self.marked_overdue = 0
+        self.reminders_sent = 0
+
+    def _push(self, task_id, deadline: datetime, now: datetime) -> None:
+        generation = next(self._seq)
+        self._latest[task_id] = generation
+        lead = timedelta(seconds=settings.TASK_REMINDER_LEAD_SECONDS)
+        if lead and deadline - lead > now:
+            heapq.heappush(self._heap, (deadline - lead, next(self._seq), REMINDER, task_id, deadline, generation))
+        heapq.heappush(self._heap, (deadline, next(self._seq), OVERDUE, task_id, deadline, generation))
+
+    def _is_current(self, entry: tuple) -> bool:
+        return self._latest.get(entry[3]) == entry[5]
+
+    def _enforce_bound(self) -> None:
+        """
+        Keep the heap within TASK_SCHEDULER_HEAP_SIZE after writes: drop
+        superseded entries, then if still too big drop the latest deadlines
+        and pull the horizon back so load() fetches them again later.
+        """
+        if len(self._heap) <= settings.TASK_SCHEDULER_HEAP_SIZE:
+            return
+        self._heap = [entry for entry in self._heap if self._is_current(entry)]
+        if len(self._heap) > settings.TASK_SCHEDULER_HEAP_SIZE:
+            entries_by_task: Dict = {}
+            for entry in self._heap:
+                entries_by_task.setdefault(entry[3], []).append(entry)
+            kept = []
+            for task_id, entries in sorted(entries_by_task.items(), key=lambda item: item[1][0][4]):
+                if len(kept) + len(entries) > settings.TASK_SCHEDULER_HEAP_SIZE:
+                    horizon = entries[0][4]
+                    break
+                kept.extend(entries)
+            kept_ids = {entry[3] for entry in kept}
+            for task_id in entries_by_task.keys() - kept_ids:
+                del self._latest[task_id]
+            self._heap = kept
+            self._horizon = horizon
+            self._horizon_ids = {entry[3] for entry in kept if entry[4] == horizon}
+        heapq.heapify(self._heap)
+
+    def notify(self, task_id, deadline: datetime) -> None:
+        """
+        Re-sync after a task write. Deadlines inside the loaded window are
+        scheduled now; later ones are picked up when the horizon reaches them.
+        """
+        if deadline.tzinfo is not None:
+            deadline = deadline.astimezone(timezone.utc).replace(tzinfo=None)
+        # Entries from before this write are superseded either way
+        self._latest.pop(task_id, None)
+        if self._horizon is None or deadline > self._horizon:
+            return
+        self._push(task_id, deadline, datetime.utcnow())
+        self._enforce_bound()
+        if self._wakeup is not None and self._heap and self._heap[0][3] == task_id:
+            self._wakeup.set()
+
+    async def load(self, now: datetime) -> None:
+        """Advance the horizon along the deadline index until it covers the lookahead or the heap is full."""
+        lookahead = settings.TASK_SCHEDULER_LOOKAHEAD_SECONDS + settings.TASK_REMINDER_LEAD_SECONDS
+        target = now + timedelta(seconds=lookahead)
+        collection = Task.get_motor_collection()
+        while self._horizon is None or self._horizon < target:
+            limit = min(settings.TASK_SCHEDULER_BATCH_SIZE, settings.TASK_SCHEDULER_HEAP_SIZE - len(self._heap))
+            if limit <= 0:
+                return
+            query = {"deadline": {"$lte": target}, "status": {"$in": OPEN_STATUSES}, "overdue_at": None}
+            if self._horizon is not None:
+                query["deadline"]["$gte"] = self._horizon
+                if self._horizon_ids:
+                    query["_id"] = {"$nin": list(self._horizon_ids)}
+            docs = await collection.find(query, {"deadline": 1}).sort("deadline", 1).limit(limit).to_list(length=limit)
+            for doc in docs:
+                self._push(doc["_id"], doc["deadline"], now)
+
+            horizon = docs[-1]["deadline"] if len(docs) == limit else target
+            seen = self._horizon_ids if horizon == self._horizon else set()
+            self._horizon_ids = seen | {doc["_id"] for doc in docs if doc["deadline"] == horizon}
+            self._horizon = horizon
+
+    def _pop_due(self, now: datetime) -> List[tuple]:
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < settings.TASK_SCHEDULER_BATCH_SIZE:
+            entry = heapq.heappop(self._heap)
+            if not self._is_current(entry):
+                continue
+            if entry[2] == OVERDUE:
+                del self._latest[entry[3]]
+            due.append(entry)
+        return due
+
+    async def process_due(self, now: datetime) -> int:
+        """Handle one batch of due entries; returns how many were popped."""
+        from .routes.tasks import TASK_SUMMARY_PROJECTION, task_summary_serializer
+
+        due = self._pop_due(now)
+        if not due:
+            return 0
+        collection = Task.get_motor_collection()
+        projection = {**TASK_SUMMARY_PROJECTION, "user_id": 1}
+
+        overdue_ids = list({entry[3] for entry in due if entry[2] == OVERDUE})
+        if overdue_ids:
+            docs = await collection.find({
+                "_id": {"$in": overdue_ids},
+                "deadline": {"$lte": now},
+                "status": {"$in": OPEN_STATUSES},
+                "overdue_at": None,
+            }, projection).to_list(length=None)
+            if docs:
+                await collection.update_many(
+                    {"_id": {"$in": [doc["_id"] for doc in docs]}, "overdue_at": None},
+                    {"$set": {"overdue_at": now}}
+                )
+                for doc in docs:
+                    task_events.publish(doc["user_id"], "task.overdue", task_summary_serializer.shape(doc))
+                await bump_versions_many((doc["user_id"] for doc in docs), TASKS)
+                self.marked_overdue += len(docs)
+
+        # Reminders only fire if the deadline they were scheduled for is unchanged
+        reminders = {entry[3]: entry[4] for entry in due if entry[2] == REMINDER}
+        if reminders:
+            docs = await collection.find({
+                "_id": {"$in": list(reminders)},
+                "status": {"$in": OPEN_STATUSES},
+            }, projection).to_list(length=None)
+            for doc in docs:
+                if abs(doc["deadline"] - reminders[doc["_id"]]) < timedelta(milliseconds=1):
+                    task_events.publish(doc["user_id"], "task.reminder", task_summary_serializer.shape(doc))
+                    self.reminders_sent += 1
+        return len(due)
+
+    async def run(self) -> None:
+        """
+        Scheduler loop; runs until cancelled.
+        Started from the application lifespan when TASK_SCHEDULER_ENABLED is set.
+        """
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                self._wakeup.clear()
+                now = datetime.utcnow()
+                await self.load(now)
+                if await self.process_due(now):
+                    # More may be due; let request handlers run between batches
+                    await asyncio.sleep(0)
+                    continue
+                timeout = settings.TASK_SCHEDULER_LOOKAHEAD_SECONDS / 2
+                if self._heap:
+                    timeout = min(timeout, (self._heap[0][0] - now).total_seconds())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(timeout, 0))
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Deadline scheduler failed: {e}")
+                await asyncio.sleep(5)
+
+    def stats(self) -> dict:
+        return {
+            "heap_size": len(self._heap),
+            "horizon": self._horizon,
+            "next_due": self._heap[0][0] if self._heap else None,
+            "marked_overdue": self.marked_overdue,
+            "reminders_sent": self.reminders_sent,
+        }
+
+
+deadline_scheduler = DeadlineScheduler()
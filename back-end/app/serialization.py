@@ -0,0 +1,72 @@
+from typing import Iterable, Optional, Type
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+def _default(value):
+    """orjson fallback for BSON and Pydantic values it does not handle natively."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(value) -> bytes:
+    """Encode a value to JSON bytes; ObjectIds become strings, datetimes ISO 8601."""
+    return orjson.dumps(value, default=_default)
+
+
+def dumps_lines(items: Iterable) -> bytes:
+    """Encode items as newline-delimited JSON."""
+    return b"".join(dumps(item) + b"\n" for item in items)
+
+
+class JSONBytesResponse(Response):
+    """
+    JSON response for pre-encoded bytes. Routes return it directly so FastAPI
+    skips response_model validation and re-encoding; response_model still
+    documents the schema in OpenAPI.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+class DocumentSerializer:
+    """
+    Shapes raw BSON documents into the field layout of a response model
+    without constructing Pydantic objects: _id is exposed as id, fields the
+    response does not declare are dropped, and missing fields take the
+    document model's defaults. Only use it on documents written by this app.
+    """
+
+    def __init__(self, response_model: Type[BaseModel], document_model: Optional[Type[BaseModel]] = None):
+        self.fields = tuple(name for name in response_model.model_fields if name != "id")
+        source = document_model or response_model
+        self.defaults = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in source.model_fields.items()
+            if not field.is_required()
+        }
+
+    def shape(self, doc: dict) -> dict:
+        item = {"id": doc["_id"]}
+        defaults = self.defaults
+        for name in self.fields:
+            item[name] = doc.get(name, defaults.get(name))
+        return item
+
+    def dumps(self, docs: Iterable[dict]) -> bytes:
+        """Encode documents as a JSON array."""
+        return dumps([self.shape(doc) for doc in docs])
+
+    def dumps_lines(self, docs: Iterable[dict]) -> bytes:
+        """Encode documents as newline-delimited JSON."""
+        return dumps_lines(self.shape(doc) for doc in docs)
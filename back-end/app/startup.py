@@ -0,0 +1,48 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class StartupReport:
+    """
+    Wall-clock durations of the startup phases of this process: importing
+    the application, connecting to MongoDB, Beanie/index initialization,
+    pool warm-up and starting background tasks. The clock starts when this
+    module is first imported, which app.main does before anything else.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.ready_seconds: Optional[float] = None
+        self.indexes_created: Optional[bool] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as one named phase."""
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - began
+
+    def mark(self, name: str) -> None:
+        """Record a phase that ran from process start until now (e.g. imports)."""
+        self.phases[name] = time.perf_counter() - self.started
+
+    def ready(self) -> None:
+        """Mark the process ready to serve and print the report."""
+        self.ready_seconds = time.perf_counter() - self.started
+        phases = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items())
+        indexes = "created" if self.indexes_created else "skipped"
+        print(f"Startup complete in {self.ready_seconds * 1000:.0f}ms ({phases}; indexes {indexes})")
+
+    def stats(self) -> dict:
+        return {
+            "ready_ms": round(self.ready_seconds * 1000, 1) if self.ready_seconds is not None else None,
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            "indexes_created": self.indexes_created,
+        }
+
+
+startup_report = StartupReport()
@@ -0,0 +1,72 @@
+import hashlib
+from typing import Iterable, Tuple
+
+from fastapi import Request, Response
+from pymongo import UpdateOne
+
+from .database import database
+
+
+# One small document per user: {"_id": user_id, "tasks": n, "labels": n}
+VERSIONS_COLLECTION = "collection_versions"
+
+TASKS = "tasks"
+LABELS = "labels"
+
+
+async def bump_versions(user_id, *scopes: str) -> None:
+    """Advance the user's version counters after a write; call once the write has succeeded."""
+    await database.database[VERSIONS_COLLECTION].update_one(
+        {"_id": user_id},
+        {"$inc": {scope: 1 for scope in scopes}},
+        upsert=True
+    )
+
+
+async def bump_versions_many(user_ids: Iterable, *scopes: str) -> None:
+    """Advance version counters for several users in one bulk write."""
+    requests = [
+        UpdateOne({"_id": user_id}, {"$inc": {scope: 1 for scope in scopes}}, upsert=True)
+        for user_id in set(user_ids)
+    ]
+    if requests:
+        await database.database[VERSIONS_COLLECTION].bulk_write(requests, ordered=False)
+
+
+async def get_versions(user_id, *scopes: str) -> Tuple[int, ...]:
+    """
+    Current version counters for a user (0 if never written).
+    Read these before loading the data so an ETag is never newer than its body.
+    """
+    doc = await database.database[VERSIONS_COLLECTION].find_one(
+        {"_id": user_id}, {scope: 1 for scope in scopes}
+    ) or {}
+    return tuple(doc.get(scope, 0) for scope in scopes)
+
+
+def build_etag(user_id, versions: Tuple[int, ...], request: Request) -> str:
+    """
+    Weak ETag for one representation of a user's collection. The query string
+    and Accept header are folded in so views, filters and NDJSON differ.
+    """
+    variant = f"{request.url.query}|{request.headers.get('accept', '')}"
+    digest = hashlib.sha1(variant.encode()).hexdigest()[:12]
+    return f'W/"{user_id}-{".".join(str(v) for v in versions)}-{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match names this ETag (weak comparison, '*' matches)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+def cache_headers(etag: str) -> dict:
+    """Headers letting clients cache the listing but revalidate every time."""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
@@ -0,0 +1,2 @@
+# Benchmarks package for the Todo App API
+# Run from back-end/ with: python -m benchmarks.<module>
@@ -0,0 +1,287 @@
+"""
+Load-test and benchmark harness for the Todo API.
+
+Seeds a database with a configurable number of users, labels and tasks, then
+drives the real FastAPI app in-process through httpx.AsyncClient at a fixed
+concurrency and reports throughput and p50/p95/p99 latency per endpoint as JSON.
+
+Run from back-end/:
+    python -m benchmarks.api_benchmark --users 5 --tasks-per-user 2000 --concurrency 16
+    python -m benchmarks.api_benchmark --mongodb-url mongodb://localhost:27017 --output bench.json
+
+Without --mongodb-url the run uses mongomock-motor as a local stand-in, which
+is deterministic but does not reflect MongoDB index performance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+# Every simulated client shares one address; the login limiter would reject most of the run
+os.environ.setdefault("RATE_LIMIT_ENABLED", "False")
+
+import httpx
+from beanie import PydanticObjectId, init_beanie
+
+from app.database import DOCUMENT_MODELS, database
+from app.main import app
+from app.models.task import PriorityLevel, TaskStatus
+from app.routes.auth import get_password_hash
+
+PASSWORD = "benchmark-password"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def connect(args):
+    """Connect to MongoDB or the mongomock-motor stand-in and initialise Beanie."""
+    if args.mongodb_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(args.mongodb_url)
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("mongomock-motor is not installed; pass --mongodb-url or pip install mongomock-motor")
+        client = AsyncMongoMockClient()
+    database.client = client
+    database.database = client[args.database]
+    if args.mongodb_url:
+        await client.drop_database(args.database)
+    await init_beanie(database=database.database, document_models=DOCUMENT_MODELS)
+
+
+async def seed(args) -> List[dict]:
+    """Insert users, labels and tasks directly and return per-user fixtures."""
+    rng = random.Random(args.seed)
+    hashed_password = get_password_hash(PASSWORD)
+    now = datetime.utcnow()
+    users = []
+    for u in range(args.users):
+        user_id = PydanticObjectId()
+        username = f"bench_user_{u}"
+        await database.database["users"].insert_one({
+            "_id": user_id,
+            "email": f"{username}@example.com",
+            "username": username,
+            "hashed_password": hashed_password,
+            "is_active": True,
+            "is_verified": True,
+            "is_admin": False,
+            "created_at": now,
+            "updated_at": now,
+        })
+        label_ids = [PydanticObjectId() for _ in range(args.labels_per_user)]
+        if label_ids:
+            await database.database["labels"].insert_many([{
+                "_id": label_id,
+                "name": f"label-{i}",
+                "user_id": user_id,
+                "color": "#3366FF",
+                "created_at": now,
+                "updated_at": now,
+            } for i, label_id in enumerate(label_ids)])
+        task_ids = []
+        for start in range(0, args.tasks_per_user, 1000):
+            batch = []
+            for i in range(start, min(start + 1000, args.tasks_per_user)):
+                task_id = PydanticObjectId()
+                task_ids.append(task_id)
+                batch.append({
+                    "_id": task_id,
+                    "title": f"Task {i} for {username}",
+                    "description": "Benchmark task " * rng.randint(1, 20),
+                    "user_id": user_id,
+                    "priority": rng.choice(list(PriorityLevel)).value,
+                    "deadline": now + timedelta(hours=rng.randint(-24 * 30, 24 * 90)),
+                    "status": rng.choice(list(TaskStatus)).value,
+                    "label_ids": rng.sample(label_ids, k=min(len(label_ids), rng.randint(0, 3))),
+                    "created_at": now,
+                    "updated_at": now,
+                    "completed_at": None,
+                })
+            await database.database["tasks"].insert_many(batch)
+        users.append({
+            "id": str(user_id),
+            "username": username,
+            "label_ids": [str(x) for x in label_ids],
+            "task_ids": [str(x) for x in task_ids],
+        })
+    return users
+
+
+async def run_scenario(
+    name: str,
+    total: int,
+    concurrency: int,
+    request: Callable[[int], Awaitable[httpx.Response]]
+) -> dict:
+    """Issue `total` requests with `concurrency` workers and summarise latency."""
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await request(i)
+                ok = response.status_code < 400
+                key = str(response.status_code)
+            except Exception as e:
+                ok = False
+                key = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors[key] = errors.get(key, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "endpoint": name,
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+async def run(args) -> dict:
+    await connect(args)
+    seed_start = time.perf_counter()
+    users = await seed(args)
+    seed_seconds = time.perf_counter() - seed_start
+    rng = random.Random(args.seed + 1)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        results = []
+
+        async def login(i):
+            user = users[i % len(users)]
+            return await client.post("/auth/login", data={"username": user["username"], "password": PASSWORD})
+
+        results.append(await run_scenario("POST /auth/login", args.login_requests, args.concurrency, login))
+
+        # One token per user for the authenticated scenarios
+        for i, user in enumerate(users):
+            response = await login(i)
+            user["headers"] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        def pick(i):
+            return users[i % len(users)]
+
+        async def list_tasks(i):
+            user = pick(i)
+            return await client.get(f"/tasks/user/{user['id']}", headers=user["headers"])
+
+        async def query_tasks(i):
+            user = pick(i)
+            params = {"status": rng.choice(list(TaskStatus)).value, "limit": 50}
+            if user["label_ids"]:
+                params["label_ids"] = [rng.choice(user["label_ids"])]
+            return await client.get("/tasks/query", params=params, headers=user["headers"])
+
+        async def create_task(i):
+            user = pick(i)
+            return await client.post("/tasks/", headers=user["headers"], json={
+                "title": f"Created task {i}",
+                "priority": rng.choice(list(PriorityLevel)).value,
+                "deadline": (datetime.utcnow() + timedelta(days=rng.randint(1, 30))).isoformat(),
+                "label_ids": user["label_ids"][:1],
+            })
+
+        async def update_task(i):
+            user = pick(i)
+            task_id = rng.choice(user["task_ids"])
+            return await client.patch(f"/tasks/{task_id}", headers=user["headers"], json={
+                "status": rng.choice(list(TaskStatus)).value,
+                "priority": rng.choice(list(PriorityLevel)).value,
+            })
+
+        async def add_label(i):
+            user = pick(i)
+            task_id = rng.choice(user["task_ids"])
+            label_id = rng.choice(user["label_ids"])
+            return await client.post(f"/tasks/{task_id}/labels/{label_id}", headers=user["headers"])
+
+        async def list_labels(i):
+            user = pick(i)
+            return await client.get("/labels/", params={"with_counts": "true"}, headers=user["headers"])
+
+        scenarios = [
+            ("GET /tasks/user/{user_id}", args.list_requests, list_tasks),
+            ("GET /tasks/query", args.requests, query_tasks),
+            ("POST /tasks/", args.requests, create_task),
+            ("PATCH /tasks/{task_id}", args.requests, update_task),
+            ("GET /labels/?with_counts=true", args.requests, list_labels),
+        ]
+        if all(user["task_ids"] and user["label_ids"] for user in users):
+            scenarios.append(("POST /tasks/{task_id}/labels/{label_id}", args.requests, add_label))
+        for name, total, request in scenarios:
+            if total > 0:
+                results.append(await run_scenario(name, total, args.concurrency, request))
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "backend": "mongodb" if args.mongodb_url else "mongomock-motor",
+        "python": platform.python_version(),
+        "config": {
+            "users": args.users,
+            "tasks_per_user": args.tasks_per_user,
+            "labels_per_user": args.labels_per_user,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "seed_seconds": round(seed_seconds, 3),
+        "results": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Todo API in-process")
+    parser.add_argument("--mongodb-url", default=None, help="Real MongoDB to seed (default: mongomock-motor stand-in)")
+    parser.add_argument("--database", default="todo_app_benchmark", help="Database name (dropped before seeding)")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--tasks-per-user", type=int, default=1000)
+    parser.add_argument("--labels-per-user", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--list-requests", type=int, default=50, help="Requests for the full task listing")
+    parser.add_argument("--login-requests", type=int, default=20, help="Requests for login (bcrypt bound)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible data and requests")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
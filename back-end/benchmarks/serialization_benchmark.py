@@ -0,0 +1,159 @@
+"""
+Micro-benchmark of task list serialisation cost.
+
+Builds synthetic raw task documents (as returned by Motor) and times the two
+ways a list endpoint can turn them into response bytes:
+
+- legacy: Task.model_validate -> task_to_response -> FastAPI response_model
+  validation and serialisation -> JSONResponse
+- fast:   DocumentSerializer shaping raw BSON -> orjson -> JSONBytesResponse
+
+No database or HTTP round trip is involved (mongomock-motor only initialises
+Beanie), so the numbers isolate CPU spent per task. Run from back-end/:
+    python -m benchmarks.serialization_benchmark --tasks 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from beanie import PydanticObjectId, init_beanie
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.database import DOCUMENT_MODELS
+from app.models.task import PriorityLevel, Task, TaskResponse, TaskStatus, TaskSummary
+from app.routes.tasks import task_response_serializer, task_summary_serializer, task_to_response
+from app.serialization import JSONBytesResponse
+
+
+def make_documents(count: int, seed: int) -> List[dict]:
+    """Raw task documents shaped like the tasks collection."""
+    rng = random.Random(seed)
+    user_id = PydanticObjectId()
+    label_ids = [PydanticObjectId() for _ in range(10)]
+    now = datetime.utcnow().replace(microsecond=0)
+    return [{
+        "_id": PydanticObjectId(),
+        "title": f"Task {i}",
+        "description": "Benchmark task " * rng.randint(1, 20),
+        "user_id": user_id,
+        "priority": rng.choice(list(PriorityLevel)).value,
+        "deadline": now + timedelta(hours=rng.randint(-24 * 30, 24 * 90)),
+        "status": rng.choice(list(TaskStatus)).value,
+        "label_ids": rng.sample(label_ids, k=rng.randint(0, 3)),
+        "created_at": now,
+        "updated_at": now,
+        "completed_at": None,
+    } for i in range(count)]
+
+
+async def legacy_full(docs: List[dict], field) -> bytes:
+    tasks = [task_to_response(Task.model_validate(doc)) for doc in docs]
+    content = await serialize_response(field=field, response_content=tasks)
+    return JSONResponse(content).body
+
+
+async def legacy_summary(docs: List[dict], field) -> bytes:
+    summaries = [TaskSummary(
+        id=str(doc["_id"]),
+        title=doc["title"],
+        priority=doc["priority"],
+        deadline=doc["deadline"],
+        status=doc["status"],
+        label_ids=[str(label_id) for label_id in doc["label_ids"]]
+    ) for doc in docs]
+    content = await serialize_response(field=field, response_content=summaries)
+    return JSONResponse(content).body
+
+
+async def fast(body: Callable[[], bytes]) -> bytes:
+    return JSONBytesResponse(body()).body
+
+
+async def time_case(func: Callable[[], Awaitable[bytes]], repeat: int) -> dict:
+    """Best-of-`repeat` wall time for one serialisation of the whole list."""
+    timings = []
+    body = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = await func()
+        timings.append(time.perf_counter() - start)
+    return {"best_seconds": min(timings), "bytes": len(body)}
+
+
+async def run(args) -> dict:
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        sys.exit("mongomock-motor is not installed; pip install mongomock-motor")
+    # Task documents need an initialised collection even when never saved
+    await init_beanie(database=AsyncMongoMockClient()["serialization_benchmark"], document_models=DOCUMENT_MODELS)
+    docs = make_documents(args.tasks, args.seed)
+    full_field = create_model_field("response", List[TaskResponse])
+    summary_field = create_model_field("response", List[TaskSummary])
+    summary_docs = [{key: doc[key] for key in ("_id", "title", "priority", "deadline", "status", "label_ids")} for doc in docs]
+
+    cases = {
+        "full": (
+            lambda: legacy_full(docs, full_field),
+            lambda: fast(lambda: task_response_serializer.dumps(docs)),
+        ),
+        "summary": (
+            lambda: legacy_summary(summary_docs, summary_field),
+            lambda: fast(lambda: task_summary_serializer.dumps(summary_docs)),
+        ),
+    }
+
+    results = []
+    for view, (legacy, encoded) in cases.items():
+        before = await time_case(legacy, args.repeat)
+        after = await time_case(encoded, args.repeat)
+        results.append({
+            "view": view,
+            "tasks": args.tasks,
+            "legacy_us_per_task": round(before["best_seconds"] / args.tasks * 1e6, 3),
+            "fast_us_per_task": round(after["best_seconds"] / args.tasks * 1e6, 3),
+            "speedup": round(before["best_seconds"] / after["best_seconds"], 2),
+            "legacy_bytes": before["bytes"],
+            "fast_bytes": after["bytes"],
+        })
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "config": {"tasks": args.tasks, "repeat": args.repeat, "seed": args.seed},
+        "results": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark task list serialisation")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the best is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write JSON results to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    output = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
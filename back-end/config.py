@@ -34,6 +34,73 @@ class Settings:
     # Database Configuration
     CONNECTION_TIMEOUT: int = int(os.getenv("CONNECTION_TIMEOUT", "10000"))
     SERVER_SELECTION_TIMEOUT: int = int(os.getenv("SERVER_SELECTION_TIMEOUT", "5000"))
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+    MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "")  # e.g. "zstd,snappy,zlib"
+    MONGO_LIST_READ_PREFERENCE: str = os.getenv("MONGO_LIST_READ_PREFERENCE", "primary")  # used by list endpoints
+    MONGO_WRITE_CONCERN: str = os.getenv("MONGO_WRITE_CONCERN", "majority")  # "majority" or a node count
+    MONGO_WRITE_JOURNAL: bool = os.getenv("MONGO_WRITE_JOURNAL", "True").lower() == "true"
+    MONGO_WARMUP_CONNECTIONS: int = int(os.getenv("MONGO_WARMUP_CONNECTIONS", "10"))  # 0 disables warm-up
+    # Index builds/checks at boot; set False on replicas and run `python -m app.migrate_indexes` per deploy instead
+    CREATE_INDEXES_ON_STARTUP: bool = os.getenv("CREATE_INDEXES_ON_STARTUP", "True").lower() == "true"
+    
+    # Slow-query profiling (opt-in): explain plans of slow commands go to a capped collection
+    SLOW_QUERY_PROFILING: bool = os.getenv("SLOW_QUERY_PROFILING", "False").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+    SLOW_QUERY_COLLECTION: str = os.getenv("SLOW_QUERY_COLLECTION", "slow_queries")
+    SLOW_QUERY_COLLECTION_BYTES: int = int(os.getenv("SLOW_QUERY_COLLECTION_BYTES", str(16 * 1024 * 1024)))
+    # queryPlanner only plans; executionStats re-runs the query to count keys/docs examined
+    SLOW_QUERY_EXPLAIN_VERBOSITY: str = os.getenv("SLOW_QUERY_EXPLAIN_VERBOSITY", "queryPlanner")
+    SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS: float = float(os.getenv("SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS", "300"))  # per query shape
+    SLOW_QUERY_MAX_CONCURRENT_EXPLAINS: int = int(os.getenv("SLOW_QUERY_MAX_CONCURRENT_EXPLAINS", "2"))  # excess explains are skipped
+    SLOW_QUERY_LOG: bool = os.getenv("SLOW_QUERY_LOG", "False").lower() == "true"  # print each slow command
+    
+    # Authenticated-user cache (per process, 0 disables)
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "1024"))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+    
+    # Password hashing (bcrypt runs off the event loop on a dedicated pool)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+    
+    # Login/registration rate limits, "<attempts>/<seconds>" per client IP and per username (0 attempts disables one)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory (per process) or redis (shared)
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))  # memory backend bound
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED_FOR", "False").lower() == "true"
+    RATE_LIMIT_LOGIN_IP: str = os.getenv("RATE_LIMIT_LOGIN_IP", "20/60")
+    RATE_LIMIT_LOGIN_USERNAME: str = os.getenv("RATE_LIMIT_LOGIN_USERNAME", "5/60")
+    RATE_LIMIT_REGISTER_IP: str = os.getenv("RATE_LIMIT_REGISTER_IP", "5/60")
+    RATE_LIMIT_REGISTER_USERNAME: str = os.getenv("RATE_LIMIT_REGISTER_USERNAME", "3/60")
+    
+    # Streaming (NDJSON) task listings
+    STREAM_BATCH_SIZE: int = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+    
+    # Per-user task statistics cache (per process, 0 disables)
+    TASK_STATS_CACHE_MAX_SIZE: int = int(os.getenv("TASK_STATS_CACHE_MAX_SIZE", "4096"))
+    TASK_STATS_CACHE_TTL_SECONDS: float = float(os.getenv("TASK_STATS_CACHE_TTL_SECONDS", "10"))
+    
+    # Label deletion and orphaned label id cleanup
+    LABEL_DELETE_USE_TRANSACTION: bool = os.getenv("LABEL_DELETE_USE_TRANSACTION", "False").lower() == "true"
+    ORPHAN_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("ORPHAN_SWEEP_INTERVAL_SECONDS", "0"))  # 0 disables
+    ORPHAN_SWEEP_BATCH_SIZE: int = int(os.getenv("ORPHAN_SWEEP_BATCH_SIZE", "500"))
+    
+    # Real-time change feed (GET /tasks/events)
+    TASK_EVENTS_SOURCE: str = os.getenv("TASK_EVENTS_SOURCE", "routes")  # routes or change_stream
+    TASK_EVENTS_QUEUE_SIZE: int = int(os.getenv("TASK_EVENTS_QUEUE_SIZE", "256"))  # per client, overflow forces a resync
+    TASK_EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv("TASK_EVENTS_HEARTBEAT_SECONDS", "15"))
+    
+    # Deadline scheduler (overdue marking and reminder events)
+    TASK_SCHEDULER_ENABLED: bool = os.getenv("TASK_SCHEDULER_ENABLED", "False").lower() == "true"  # enable in one process per deployment
+    TASK_SCHEDULER_HEAP_SIZE: int = int(os.getenv("TASK_SCHEDULER_HEAP_SIZE", "50000"))
+    TASK_SCHEDULER_BATCH_SIZE: int = int(os.getenv("TASK_SCHEDULER_BATCH_SIZE", "500"))
+    TASK_SCHEDULER_LOOKAHEAD_SECONDS: float = float(os.getenv("TASK_SCHEDULER_LOOKAHEAD_SECONDS", "3600"))
+    TASK_REMINDER_LEAD_SECONDS: float = float(os.getenv("TASK_REMINDER_LEAD_SECONDS", "900"))  # 0 disables reminders
     
     @classmethod
     def get_database_url(cls) -> str:
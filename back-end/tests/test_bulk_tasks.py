@@ -0,0 +1,109 @@
+"""
+POST /tasks/bulk: repeated targets are rejected up front, and updates/deletes
+whose task disappears between the ownership read and the write are reported
+as failed. Runs against mongomock-motor (see requirements.txt); from back-end/:
+    python -m pytest tests
+"""
+import asyncio
+import os
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "False")
+
+import httpx
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient, AsyncMongoMockCollection
+
+from app.database import DOCUMENT_MODELS, database
+from app.main import app
+from app.models.task import Task
+
+
+async def authenticated_client():
+    client = AsyncMongoMockClient()
+    database.client = client
+    database.database = client["test"]
+    await init_beanie(database=database.database, document_models=DOCUMENT_MODELS)
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    await http.post("/auth/register", json={"email": "a@example.com", "username": "alice", "password": "password123"})
+    response = await http.post("/auth/login", data={"username": "alice", "password": "password123"})
+    http.headers["Authorization"] = "Bearer " + response.json()["access_token"]
+    return http
+
+
+async def create_task(http, title: str) -> str:
+    response = await http.post("/tasks/", json={"title": title, "priority": "High", "deadline": "2030-01-01T00:00:00"})
+    return response.json()["id"]
+
+
+def test_bulk_rejects_repeated_task_id():
+    async def scenario():
+        http = await authenticated_client()
+        try:
+            task_id = await create_task(http, "x")
+            response = await http.post("/tasks/bulk", json={"operations": [
+                {"op": "delete", "task_id": task_id},
+                {"op": "update", "task_id": task_id, "update": {"title": "y"}},
+            ]})
+            assert response.status_code == 400
+            assert [error["index"] for error in response.json()["detail"]] == [1]
+            assert await Task.get_motor_collection().count_documents({}) == 1
+        finally:
+            await http.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_bulk_reports_targets_deleted_concurrently(monkeypatch):
+    async def scenario():
+        http = await authenticated_client()
+        try:
+            updated_id = await create_task(http, "updated")
+            deleted_id = await create_task(http, "deleted")
+            vanished_id = await create_task(http, "vanished")
+
+            # Another request deletes one target after the ownership read
+            original_bulk_write = AsyncMongoMockCollection.bulk_write
+
+            async def racing_bulk_write(self, requests, **kwargs):
+                await self.delete_one({"title": "vanished"})
+                return await original_bulk_write(self, requests, **kwargs)
+
+            monkeypatch.setattr(AsyncMongoMockCollection, "bulk_write", racing_bulk_write)
+            response = await http.post("/tasks/bulk", json={"operations": [
+                {"op": "update", "task_id": updated_id, "update": {"title": "renamed"}},
+                {"op": "update", "task_id": vanished_id, "update": {"title": "lost"}},
+                {"op": "delete", "task_id": deleted_id},
+            ]})
+            body = response.json()
+            assert response.status_code == 200
+            assert [(r["success"], r["error"]) for r in body["results"]] == [
+                (True, None), (False, "Task not found"), (True, None)
+            ]
+            assert (body["updated"], body["deleted"], body["failed"]) == (1, 1, 1)
+        finally:
+            await http.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_bulk_reports_delete_of_task_deleted_concurrently(monkeypatch):
+    async def scenario():
+        http = await authenticated_client()
+        try:
+            task_id = await create_task(http, "vanished")
+            original_bulk_write = AsyncMongoMockCollection.bulk_write
+
+            async def racing_bulk_write(self, requests, **kwargs):
+                await self.delete_one({"title": "vanished"})
+                return await original_bulk_write(self, requests, **kwargs)
+
+            monkeypatch.setattr(AsyncMongoMockCollection, "bulk_write", racing_bulk_write)
+            response = await http.post("/tasks/bulk", json={"operations": [{"op": "delete", "task_id": task_id}]})
+            result = response.json()["results"][0]
+            assert (result["success"], result["error"]) == (False, "Task not found")
+            assert response.json()["deleted"] == 0
+        finally:
+            await http.aclose()
+
+    asyncio.run(scenario())
@@ -21,6 +21,9 @@ export default function Tasks() {
   const [filterUrgent, setFilterUrgent] = useState(false);
   const [filterDueToday, setFilterDueToday] = useState(false);
   const [filterDueTomorrow, setFilterDueTomorrow] = useState(false);
+  // Task ids due today / tomorrow (local time), from the server-side agenda,
+  // with the task-set key they were loaded for
+  const [dueIds, setDueIds] = useState(null);
 
   // Redirect to login if not authenticated
   useEffect(() => {
@@ -78,6 +81,54 @@ export default function Tasks() {
     }
   }, [user?.id]);
 
+  // Apply changes made on other devices without refetching the whole list
+  useEffect(() => {
+    if (!user?.id) return undefined;
+    return taskService.subscribeToEvents((type, data) => {
+      if (type === 'task.created') {
+        setTasks(prev => (prev.some(task => task.id === data.id) ? prev : [...prev, data]));
+      } else if (type === 'task.updated') {
+        setTasks(prev => prev.map(task => (task.id === data.id ? { ...task, ...data } : task)));
+      } else if (type === 'task.deleted') {
+        setTasks(prev => prev.filter(task => task.id !== data.id));
+      } else if (type === 'tasks.bulk' || type === 'label.deleted' || type === 'resync') {
+        loadTasks();
+      }
+    });
+  }, [user?.id]);
+
+  // Load today's and tomorrow's agenda buckets for the due-date quick filters.
+  // Only ids and deadlines matter, so other edits (and SSE refreshes that
+  // return the same tasks) do not refetch.
+  const dueFilterActive = filterDueToday || filterDueTomorrow;
+  const dueKey = tasks.map(task => `${task.id}:${task.deadline}`).sort().join(',');
+  useEffect(() => {
+    if (!dueFilterActive) return undefined;
+    let cancelled = false;
+    const localDate = (offset) => {
+      const d = new Date();
+      d.setDate(d.getDate() + offset);
+      return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`;
+    };
+    taskService.getAgenda(localDate(0), localDate(1))
+      .then(agenda => {
+        if (!cancelled) setDueIds({ key: dueKey, days: agenda.days.map(day => new Set(day.tasks.map(task => task.id))) });
+      })
+      .catch(err => {
+        console.error('Failed to load agenda', err);
+        if (!cancelled) setDueIds(null);
+      });
+    return () => { cancelled = true; };
+  }, [dueFilterActive, dueKey]);
+
+  // Local fallback until the agenda for the current tasks has loaded
+  const localDueOffset = (task) => {
+    const today = new Date(); today.setHours(0,0,0,0);
+    const deadline = new Date(task.deadline);
+    const dl = new Date(deadline.getFullYear(), deadline.getMonth(), deadline.getDate());
+    return Math.round((dl - today) / (1000*60*60*24));
+  };
+
   const handleCreateTask = async (taskData) => {
     try {
       const newTask = await taskService.createTask(taskData);
@@ -132,15 +183,13 @@ export default function Tasks() {
     // Quick filters
     if (filterUrgent && t.priority !== 'High') return false;
     if (filterDueToday || filterDueTomorrow) {
-      try {
-        const today = new Date(); today.setHours(0,0,0,0);
-        const deadline = new Date(t.deadline);
-        const dl = new Date(deadline.getFullYear(), deadline.getMonth(), deadline.getDate());
-        const diffDays = Math.round((dl - today) / (1000*60*60*24));
+      if (dueIds && dueIds.key === dueKey) {
+        if (filterDueToday && !dueIds.days[0].has(t.id)) return false;
+        if (filterDueTomorrow && !dueIds.days[1].has(t.id)) return false;
+      } else {
+        const diffDays = localDueOffset(t);
         if (filterDueToday && diffDays !== 0) return false;
         if (filterDueTomorrow && diffDays !== 1) return false;
-      } catch {
-        return false;
       }
     }
     return true;
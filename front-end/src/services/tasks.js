@@ -17,6 +17,16 @@ export const taskService = {
     }
   },
 
+  // Tasks due between two local dates (YYYY-MM-DD, inclusive), bucketed by local day
+  async getAgenda(from, to, tz = Intl.DateTimeFormat().resolvedOptions().timeZone) {
+    try {
+      const response = await api.get('/tasks/agenda', { params: { from, to, tz } });
+      return response.data;
+    } catch (error) {
+      throw handleError(error);
+    }
+  },
+
   async createTask(taskData) {
     try {
       const response = await api.post('/tasks/', taskData);
@@ -49,6 +59,48 @@ export const taskService = {
     }
   },
 
+  // Live task/label changes over Server-Sent Events; returns an unsubscribe function.
+  // EventSource cannot send headers, so each connection uses a short-lived
+  // stream token in the URL instead of the bearer token.
+  subscribeToEvents(onEvent) {
+    if (typeof window === 'undefined' || !window.EventSource) return () => {};
+    const events = ['task.created', 'task.updated', 'task.deleted', 'tasks.bulk', 'label.created', 'label.updated', 'label.deleted', 'resync'];
+    let source = null;
+    let retryTimer = null;
+    let closed = false;
+
+    const connect = async (isReconnect) => {
+      try {
+        const response = await api.post('/auth/stream-token');
+        if (closed) return;
+        const url = new URL('/tasks/events', api.defaults.baseURL);
+        url.searchParams.set('stream_token', response.data.stream_token);
+        source = new EventSource(url.toString());
+        events.forEach((type) => {
+          source.addEventListener(type, (message) => onEvent(type, JSON.parse(message.data)));
+        });
+        // Changes made while disconnected were missed
+        if (isReconnect) source.addEventListener('open', () => onEvent('resync', {}), { once: true });
+        source.onerror = () => {
+          // The browser retries on its own unless the server refused the
+          // (expired) token; then reconnect with a fresh one
+          if (source.readyState === EventSource.CLOSED) {
+            retryTimer = setTimeout(() => connect(true), 5000);
+          }
+        };
+      } catch (error) {
+        if (!closed) retryTimer = setTimeout(() => connect(true), 5000);
+      }
+    };
+
+    connect(false);
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      if (source) source.close();
+    };
+  },
+
   async toggleTaskComplete(taskId) {
     try {
       const response = await api.patch(`/tasks/${taskId}/toggle`);